@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from infra.db.base import Base
-from domain.models import UserEventFeedback, User, Interest, Event
+from domain.models import UserEventFeedback, User, Interest, Event, CrawlState, InterestClosure, EventCoLike, UserLikeSnapshot
 
 
 config = context.config
@@ -0,0 +1,37 @@
+"""Add crawl state
+
+Revision ID: 5b2e9c1d7f40
+Revises: 0340cb4673d3
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e9c1d7f40'
+down_revision: Union[str, Sequence[str], None] = '0340cb4673d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('crawl_state',
+    sa.Column('link', sa.String(length=500), nullable=False),
+    sa.Column('fingerprint', sa.String(length=32), nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('link')
+    )
+    op.create_index(op.f('ix_crawl_state_event_id'), 'crawl_state', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_crawl_state_event_id'), table_name='crawl_state')
+    op.drop_table('crawl_state')
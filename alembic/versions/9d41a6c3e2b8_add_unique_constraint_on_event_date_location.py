@@ -0,0 +1,32 @@
+"""Add unique constraint on event date location
+
+Revision ID: 9d41a6c3e2b8
+Revises: 5b2e9c1d7f40
+Create Date: 2026-10-18 11:03:17.842901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41a6c3e2b8'
+down_revision: Union[str, Sequence[str], None] = '5b2e9c1d7f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text(
+        "DELETE FROM event_date_locations a USING event_date_locations b "
+        "WHERE a.event_id = b.event_id AND a.date = b.date AND a.location = b.location AND a.id > b.id"
+    ))
+    op.create_unique_constraint('uq_event_date_location', 'event_date_locations', ['event_id', 'date', 'location'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_event_date_location', 'event_date_locations', type_='unique')
@@ -0,0 +1,43 @@
+"""Add co-like model
+
+Revision ID: b1da7a8764ff
+Revises: f4b8c2d91a37
+Create Date: 2026-10-18 17:35:58.906106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1da7a8764ff'
+down_revision: Union[str, Sequence[str], None] = 'f4b8c2d91a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_co_likes',
+    sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('other_event_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('likes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['other_event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'other_event_id')
+    )
+    op.create_table('user_like_snapshot',
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'event_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_like_snapshot')
+    op.drop_table('event_co_likes')
@@ -0,0 +1,28 @@
+"""Add index on event date location date
+
+Revision ID: c7f3a8e05d12
+Revises: 9d41a6c3e2b8
+Create Date: 2026-10-18 17:41:08.215734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f3a8e05d12'
+down_revision: Union[str, Sequence[str], None] = '9d41a6c3e2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_event_date_locations_date'), 'event_date_locations', ['date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_event_date_locations_date'), table_name='event_date_locations')
@@ -0,0 +1,40 @@
+"""Add event occurrence columns
+
+Revision ID: d82b547c9e8b
+Revises: b1da7a8764ff
+Create Date: 2026-10-18 17:40:21.174918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd82b547c9e8b'
+down_revision: Union[str, Sequence[str], None] = 'b1da7a8764ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('next_occurrence', sa.DateTime(), nullable=True))
+    op.add_column('events', sa.Column('last_occurrence', sa.DateTime(), nullable=True))
+    op.execute(sa.text(
+        "UPDATE events SET next_occurrence = dates.next_occurrence, last_occurrence = dates.last_occurrence "
+        "FROM (SELECT event_id, min(date) AS next_occurrence, max(date) AS last_occurrence "
+        "FROM event_date_locations GROUP BY event_id) AS dates "
+        "WHERE events.id = dates.event_id"
+    ))
+    op.create_index(op.f('ix_events_last_occurrence'), 'events', ['last_occurrence'], unique=False)
+    op.create_index(op.f('ix_events_next_occurrence'), 'events', ['next_occurrence'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_events_next_occurrence'), table_name='events')
+    op.drop_index(op.f('ix_events_last_occurrence'), table_name='events')
+    op.drop_column('events', 'last_occurrence')
+    op.drop_column('events', 'next_occurrence')
@@ -0,0 +1,28 @@
+"""Add index on event interest association interest id
+
+Revision ID: e2a9d4b7c610
+Revises: c7f3a8e05d12
+Create Date: 2026-10-18 18:12:44.508163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9d4b7c610'
+down_revision: Union[str, Sequence[str], None] = 'c7f3a8e05d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_event_interest_association_interest_id'), 'event_interest_association', ['interest_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_event_interest_association_interest_id'), table_name='event_interest_association')
@@ -0,0 +1,47 @@
+"""Add interest closure
+
+Revision ID: f4b8c2d91a37
+Revises: e2a9d4b7c610
+Create Date: 2026-10-18 18:47:21.930517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8c2d91a37'
+down_revision: Union[str, Sequence[str], None] = 'e2a9d4b7c610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('interest_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['interests.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['interests.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index(op.f('ix_interest_closure_descendant_id'), 'interest_closure', ['descendant_id'], unique=False)
+    op.execute(sa.text(
+        "WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS ("
+        " SELECT id, id, 0 FROM interests"
+        " UNION ALL"
+        " SELECT closure.ancestor_id, interests.id, closure.depth + 1"
+        " FROM closure JOIN interests ON interests.parent_id = closure.descendant_id"
+        ") "
+        "INSERT INTO interest_closure (ancestor_id, descendant_id, depth) "
+        "SELECT ancestor_id, descendant_id, depth FROM closure"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_interest_closure_descendant_id'), table_name='interest_closure')
+    op.drop_table('interest_closure')
@@ -1,23 +1,72 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from infra.repositories import EventCRUD
 from domain.models import User
-from domain.schemas import EventCreate, EventRead
-from domain.services.algorithms import FilterAlgorithm
+from domain.schemas import EventCreate, EventRead, EventPage, IngestionJobRead, PruneResult, RecommendationPage, EventSearchPage
+from domain.services.algorithms import FilterAlgorithm, RankingMode
+from domain.services.ingestion import ingestion_runner
+from domain.services.recommendations import recommendation_cache
 from infra.deps import get_event_crud, get_current_user
-from typing import List
+from domain import exeptions
+from typing import List, Optional, AsyncIterator, Dict, Any
+from datetime import datetime
+from uuid import UUID
 from infra.deps.database import get_async_session
+from infra.db.session import SessionLocal
 
 
 router = APIRouter(prefix="/event", tags=["events"])
 
-@router.get("/recommendations", response_model=List[EventRead], status_code=status.HTTP_200_OK)
+@router.get("/recommendations", response_model=RecommendationPage, status_code=status.HTTP_200_OK)
 async def get_recommendations(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    mode: RankingMode = "numpy",
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session),
-) -> List[EventRead]:
+) -> RecommendationPage:
     rec = FilterAlgorithm(session, user)
-    return await rec.filter()
+    return await rec.page(limit, cursor, mode)
+
+
+@router.get("/recommendations/metrics", response_model=Dict[str, Any], status_code=status.HTTP_200_OK)
+async def get_recommendation_cache_metrics() -> Dict[str, Any]:
+    return recommendation_cache.as_dict()
+
+
+@router.get("/", response_model=EventPage, status_code=status.HTTP_200_OK)
+async def get_events(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[UUID] = None,
+    interest_id: Optional[List[int]] = Query(None),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    stream: bool = False,
+    event_crud: EventCRUD = Depends(get_event_crud),
+):
+    if stream:
+        async def ndjson() -> AsyncIterator[str]:
+            async with SessionLocal() as session:
+                stream_crud = EventCRUD(session, event_parser=event_crud.event_parser)
+                async for event in stream_crud.stream_events(cursor, interest_id, date_from, date_to):
+                    yield event.model_dump_json() + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    return await event_crud.get_events_page(limit, cursor, interest_id, date_from, date_to)
+
+
+@router.get("/search", response_model=EventSearchPage, status_code=status.HTTP_200_OK)
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    interest_id: Optional[List[int]] = Query(None),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    event_crud: EventCRUD = Depends(get_event_crud),
+) -> EventSearchPage:
+    return await event_crud.search_events(q, limit, cursor, interest_id, date_from, date_to)
 
 
 @router.post("/", response_model=EventRead, status_code=status.HTTP_201_CREATED)
@@ -27,19 +76,28 @@ async def create_event(
 ) -> EventRead:
     return await event_crud.event_create(event)
 
-@router.post("/pars", response_model=List[EventRead], status_code=status.HTTP_201_CREATED)
-async def create_events_from_parser(
-    event_crud: EventCRUD = Depends(get_event_crud)
-) -> List[EventRead]:
-    await event_crud.add_events_from_parser()
-    return await event_crud.get_all_events()
+@router.post("/pars", response_model=IngestionJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def create_events_from_parser() -> IngestionJobRead:
+    job = ingestion_runner.start()
+    return IngestionJobRead.model_validate(job)
+
+@router.get("/pars", response_model=List[IngestionJobRead], status_code=status.HTTP_200_OK)
+async def get_ingestion_jobs() -> List[IngestionJobRead]:
+    return list(IngestionJobRead.model_validate(job) for job in ingestion_runner.recent())
+
+@router.get("/pars/{job_id}", response_model=IngestionJobRead, status_code=status.HTTP_200_OK)
+async def get_ingestion_job(job_id: UUID) -> IngestionJobRead:
+    job = ingestion_runner.get(job_id)
+    if job is None:
+        raise exeptions.NotFoundException("Ingestion job not found")
+    return IngestionJobRead.model_validate(job)
 
-@router.delete("/", response_model=List[EventRead], status_code=status.HTTP_200_OK)
+@router.delete("/", response_model=PruneResult, response_model_exclude_none=True, status_code=status.HTTP_200_OK)
 async def delete_invalid_events(
+        include_deleted: bool = False,
         event_crud: EventCRUD = Depends(get_event_crud)
-)-> List[EventRead]:
-    deleted_events = await event_crud.delete_invalid_events()
-    return deleted_events
+)-> PruneResult:
+    return await event_crud.delete_invalid_events(include_deleted=include_deleted)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import tempfile
+import time
+from typing import Dict, Any, Optional
+
+from domain.services.afisha import EventParser, PageCache
+from .corpus import Corpus, synthesize
+from .server import CorpusServer
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+async def run_once(server: CorpusServer, *, parse_workers: Optional[int] = None,
+                   page_cache: Optional[PageCache] = None) -> Dict[str, Any]:
+    parser = EventParser(
+        sources=server.corpus.afisha_sources(server.base_url),
+        parse_workers=parse_workers,
+        page_cache=page_cache,
+    )
+    cpu_started = _cpu_seconds()
+    started = time.perf_counter()
+    events = await parser.parse()
+    wall = time.perf_counter() - started
+    cpu = _cpu_seconds() - cpu_started
+
+    pages = parser.http_client.stats.requests
+    return {
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "pages": pages,
+        "events": len(events),
+        "pages_per_sec": round(pages / wall, 1) if wall else None,
+        "events_per_sec": round(len(events) / wall, 1) if wall else None,
+        "connections": parser.http_client.stats.as_dict(),
+        "final_concurrency": parser.current_concurrency,
+        "page_cache": page_cache.stats.as_dict() if page_cache else None,
+    }
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark EventParser.parse() against a local fixture corpus")
+    arg_parser.add_argument("--corpus", help="corpus directory (synthesized into a temp dir when omitted)")
+    arg_parser.add_argument("--events", type=int, default=200, help="events to synthesize")
+    arg_parser.add_argument("--latency", type=float, default=0.02, help="per-request latency, seconds")
+    arg_parser.add_argument("--jitter", type=float, default=0.01, help="extra random latency, seconds")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 responses")
+    arg_parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of 429 responses")
+    arg_parser.add_argument("--retry-after", type=int, default=None)
+    arg_parser.add_argument("--parse-workers", type=int, default=None)
+    arg_parser.add_argument("--page-cache", action="store_true", help="enable the conditional-GET page cache")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--json", action="store_true", help="print one JSON object per run")
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = Corpus.load(args.corpus) if args.corpus else synthesize(tmp_dir, events=args.events)
+        page_cache = PageCache(os.path.join(tmp_dir, "page_cache.json")) if args.page_cache else None
+
+        with CorpusServer(corpus, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+                          seed=args.seed) as server:
+            for run in range(1, args.repeat + 1):
+                if page_cache:
+                    page_cache.stats = type(page_cache.stats)()
+                result = asyncio.run(run_once(server, parse_workers=args.parse_workers, page_cache=page_cache))
+                result["run"] = run
+                result["peak_rss_mib"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+                if args.json:
+                    print(json.dumps(result))
+                else:
+                    print(f"run {run}: {result['pages']} pages, {result['events']} events in "
+                          f"{result['wall_seconds']}s ({result['pages_per_sec']} pages/s, "
+                          f"{result['events_per_sec']} events/s), cpu {result['cpu_seconds']}s, "
+                          f"peak rss {result['peak_rss_mib']} MiB, concurrency {result['final_concurrency']}")
+
+
+if __name__ == "__main__":
+    main()
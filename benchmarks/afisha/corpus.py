@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from domain.services.afisha import EventParser, AfishaSource, get_sources
+
+
+BASE_URL_PLACEHOLDER = "__BASE_URL__"
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class Corpus:
+    path: str
+    routes: Dict[str, str]
+    sources: List[dict]
+
+    @classmethod
+    def load(cls, path: str) -> "Corpus":
+        with open(os.path.join(path, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return cls(path=path, routes=manifest["routes"], sources=manifest["sources"])
+
+    def save(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump({"routes": self.routes, "sources": self.sources}, f, ensure_ascii=False, indent=2)
+
+    def read(self, route: str) -> Optional[bytes]:
+        filename = self.routes.get(route)
+        if filename is None:
+            return None
+        with open(os.path.join(self.path, filename), "rb") as f:
+            return f.read()
+
+    def write(self, route: str, filename: str, body: str) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, filename), "w", encoding="utf-8") as f:
+            f.write(body)
+        self.routes[route] = filename
+
+    def afisha_sources(self, base_url: str) -> List[AfishaSource]:
+        return [
+            AfishaSource(
+                name=source["name"],
+                url=f"{base_url}{source['path']}",
+                parent_interest=source["parent_interest"],
+                max_pages=source["max_pages"],
+            )
+            for source in self.sources
+        ]
+
+    @property
+    def detail_pages(self) -> int:
+        return sum(1 for route in self.routes if route.startswith("/detail/"))
+
+
+def _listing_page(links: List[str], titles: List[str]) -> str:
+    items = "".join(
+        f'<div class="b-afisha-layout_strap--item"><img data-src="/img/{i}.jpg">'
+        f'<a class="b-afisha_blocks-strap_item_lnk_txt" href="{link}">{title}</a></div>'
+        for i, (link, title) in enumerate(zip(links, titles))
+    )
+    return f"<html><body><div class=\"b-afisha-layout_strap\">{items}</div></body></html>"
+
+
+def _detail_page(rng: random.Random, index: int, venues: int, seances: int) -> str:
+    start = datetime(2030, 1, 1) + timedelta(days=index % 30)
+    tags = "".join(f"<a href=\"/tag/{t}\">Жанр {t}</a>" for t in rng.sample(range(40), 3))
+    blocks = []
+    for venue in range(venues):
+        times = "".join(
+            f'<a class="schedule__seance-time" data-date-format='
+            f'"{(start + timedelta(hours=3 * s + venue)).strftime("%m/%d/%Y %H.%M")}">'
+            f'{(start + timedelta(hours=3 * s + venue)).strftime("%H:%M")}</a>'
+            for s in range(seances)
+        )
+        blocks.append(
+            f'<div class="schedule__item"><div class="schedule__place">'
+            f'<a class="schedule__place-link">Площадка {venue}</a>'
+            f'<span class="text-black-light">ул. Примерная, {venue + 1}</span></div>'
+            f'<div class="schedule__seance"><div class="schedule__seance-wrap">{times}</div></div></div>'
+        )
+    description = " ".join(f"Описание события {index}." for _ in range(rng.randint(5, 40)))
+    return (
+        f"<html><body><div class=\"b-afisha_cinema_description_text\">{description}</div>"
+        f"<div class=\"b-afisha_cinema_description_table\">{tags}<a>+375 (29) 000-00-00</a></div>"
+        f"<div class=\"schedule\">{''.join(blocks)}</div></body></html>"
+    )
+
+
+def synthesize(path: str, events: int = 200, pages: int = 2, venues: int = 5,
+               seances: int = 8, seed: int = 42) -> Corpus:
+    rng = random.Random(seed)
+    corpus = Corpus(path=path, routes={}, sources=[])
+    sections = [("kino", "Movies"), ("festivali", "Festivals")]
+    per_page = max(1, events // (len(sections) * pages))
+    index = 0
+    for name, parent in sections:
+        corpus.sources.append({"name": name, "path": f"/{name}/", "parent_interest": parent, "max_pages": pages})
+        for page in range(1, pages + 1):
+            links, titles = [], []
+            for _ in range(per_page):
+                route = f"/detail/{index}"
+                corpus.write(route, f"detail-{index}.html", _detail_page(rng, index, venues, seances))
+                links.append(f"{BASE_URL_PLACEHOLDER}{route}")
+                titles.append(f"Событие {index}")
+                index += 1
+            route = f"/{name}/" if page == 1 else f"/{name}/?page={page}"
+            corpus.write(route, f"{name}-{page}.html", _listing_page(links, titles))
+    corpus.save()
+    return corpus
+
+
+async def record(path: str, source_names: Optional[List[str]] = None, max_details: int = 50) -> Corpus:
+    corpus = Corpus(path=path, routes={}, sources=[])
+    index = 0
+    async with EventParser(sources=get_sources(source_names)) as parser:
+        for source in parser.sources:
+            pages = 0
+            for page in range(1, source.max_pages + 1):
+                html = await parser.fetch_html(source.page_url(page))
+                if not html:
+                    break
+                pages += 1
+                for event in parser.extract_listing(html, source.selectors)[:max_details]:
+                    response = await parser.http_client.get(event["link"])
+                    if response.status_code != 200:
+                        continue
+                    route = f"/detail/{index}"
+                    corpus.write(route, f"detail-{index}.html", response.text)
+                    html = html.replace(f'"{event["link"]}"', f'"{BASE_URL_PLACEHOLDER}{route}"')
+                    index += 1
+                route = f"/{source.name}/" if page == 1 else f"/{source.name}/?{source.page_param}={page}"
+                corpus.write(route, f"{source.name}-{page}.html", html)
+            corpus.sources.append({
+                "name": source.name,
+                "path": f"/{source.name}/",
+                "parent_interest": source.parent_interest,
+                "max_pages": pages,
+            })
+    corpus.save()
+    return corpus
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Record or synthesize an afisha fixture corpus")
+    arg_parser.add_argument("path")
+    arg_parser.add_argument("--record", action="store_true", help="record pages from the live site")
+    arg_parser.add_argument("--sources", nargs="*", default=None)
+    arg_parser.add_argument("--max-details", type=int, default=50)
+    arg_parser.add_argument("--events", type=int, default=200)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+
+    if args.record:
+        result = asyncio.run(record(args.path, args.sources, args.max_details))
+    else:
+        result = synthesize(args.path, events=args.events, seed=args.seed)
+    print(f"{len(result.routes)} pages ({result.detail_pages} detail) written to {result.path}")
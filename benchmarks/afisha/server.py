@@ -0,0 +1,93 @@
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .corpus import Corpus, BASE_URL_PLACEHOLDER
+
+
+class CorpusServer:
+    def __init__(self, corpus: Corpus, *, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: Optional[int] = None, seed: int = 0):
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                delay = server.latency + server.jitter * server._roll()
+                if delay:
+                    time.sleep(delay)
+
+                roll = server._roll()
+                if roll < server.throttle_rate:
+                    headers = {"Retry-After": str(server.retry_after)} if server.retry_after is not None else {}
+                    return self._send(429, b"", headers)
+                if roll < server.throttle_rate + server.error_rate:
+                    return self._send(503, b"")
+
+                body = server.corpus.read(self.path)
+                if body is None:
+                    return self._send(404, b"")
+                body = body.replace(BASE_URL_PLACEHOLDER.encode(), server.base_url.encode())
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, b"", {"ETag": etag})
+                self._send(200, body, {"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+            def _send(self, status: int, body: bytes, headers: Optional[dict] = None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "CorpusServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "CorpusServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
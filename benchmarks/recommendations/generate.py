@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, String, TextClause, text, bindparam, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from domain.models import Interest
+from domain.models.interest_closure import closure_insert_statements
+from infra.db.session import engine
+
+
+PARAM_TYPES = {
+    "seed": String(),
+    "lo": Integer(),
+    "hi": Integer(),
+    "users": Integer(),
+    "events": Integer(),
+    "venues": Integer(),
+    "interests": ARRAY(Integer),
+}
+
+BENCH_EVENTS = "SELECT id FROM events WHERE title LIKE 'Bench event %' AND description_hash = replace(id::text, '-', '')"
+BENCH_USERS = "SELECT id FROM users WHERE username LIKE 'bench\\_%' AND password_hash = 'bench'"
+
+CLEANUP = tuple(text(sql) for sql in (
+    f"DELETE FROM user_event_feedback WHERE user_id IN ({BENCH_USERS}) OR event_id IN ({BENCH_EVENTS})",
+    f"DELETE FROM user_interest_association WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM event_interest_association WHERE event_id IN ({BENCH_EVENTS})",
+    f"DELETE FROM event_date_locations WHERE event_id IN ({BENCH_EVENTS})",
+    f"DELETE FROM events WHERE id IN ({BENCH_EVENTS})",
+    f"DELETE FROM users WHERE id IN ({BENCH_USERS})",
+    "DELETE FROM interests WHERE name LIKE 'bench-%'",
+))
+
+
+def statement(sql: str) -> TextClause:
+    return text(sql).bindparams(*(
+        bindparam(name, type_=type_) for name, type_ in PARAM_TYPES.items() if f":{name}" in sql
+    ))
+
+
+INSERT_EVENTS = statement("""
+    INSERT INTO events (id, title, description, description_hash, is_active)
+    SELECT md5(:seed || '-event-' || i)::uuid, 'Bench event ' || i,
+           repeat('Bench description ' || i || '. ', 1 + i % 8), md5(:seed || '-event-' || i), true
+    FROM generate_series(:lo, :hi) AS i
+""")
+
+INSERT_EVENT_INTERESTS = statement("""
+    INSERT INTO event_interest_association (event_id, interest_id)
+    SELECT md5(:seed || '-event-' || i)::uuid,
+           (:interests)[1 + floor(power(random(), 2) * cardinality(:interests))::int]
+    FROM generate_series(:lo, :hi) AS i, generate_series(1, 1 + i % 3) AS n
+    ON CONFLICT DO NOTHING
+""")
+
+INSERT_DATE_LOCATIONS = statement("""
+    INSERT INTO event_date_locations (event_id, date, location)
+    SELECT md5(:seed || '-event-' || i)::uuid,
+           date_trunc('minute', now()::timestamp - interval '1 day' + random() * interval '31 days'),
+           'Bench venue ' || floor(random() * :venues)::int
+    FROM generate_series(:lo, :hi) AS i, generate_series(1, 1 + i % 5) AS n
+    ON CONFLICT DO NOTHING
+""")
+
+UPDATE_OCCURRENCES = statement("""
+    UPDATE events SET next_occurrence = dates.next_occurrence, last_occurrence = dates.last_occurrence
+    FROM (
+        SELECT event_id, min(date) AS next_occurrence, max(date) AS last_occurrence
+        FROM event_date_locations
+        WHERE event_id IN (SELECT md5(:seed || '-event-' || i)::uuid FROM generate_series(:lo, :hi) AS i)
+        GROUP BY event_id
+    ) AS dates
+    WHERE events.id = dates.event_id
+""")
+
+INSERT_USERS = statement("""
+    INSERT INTO users (id, username, email, password_hash)
+    SELECT md5(:seed || '-user-' || i)::uuid, 'bench_' || :seed || '_' || i,
+           'bench_' || :seed || '_' || i || '@example.com', 'bench'
+    FROM generate_series(:lo, :hi) AS i
+""")
+
+INSERT_USER_INTERESTS = statement("""
+    INSERT INTO user_interest_association (user_id, interest_id)
+    SELECT md5(:seed || '-user-' || i)::uuid,
+           (:interests)[1 + floor(power(random(), 2) * cardinality(:interests))::int]
+    FROM generate_series(:lo, :hi) AS i, generate_series(1, 1 + i % 6) AS n
+    ON CONFLICT DO NOTHING
+""")
+
+INSERT_FEEDBACK = statement("""
+    INSERT INTO user_event_feedback (user_id, event_id, "like")
+    SELECT DISTINCT ON (user_id, event_id) user_id, event_id, "like"
+    FROM (
+        SELECT md5(:seed || '-user-' || (1 + r % :users))::uuid AS user_id,
+               md5(:seed || '-event-' || (1 + floor(power(random(), 2.5) * :events)::int))::uuid AS event_id,
+               CASE WHEN x < 0.6 THEN true WHEN x < 0.9 THEN false END AS "like"
+        FROM generate_series(:lo, :hi) AS r, LATERAL (SELECT random() + r * 0 AS x) AS roll
+    ) AS drawn
+    WHERE NOT EXISTS (
+        SELECT 1 FROM user_event_feedback AS f WHERE f.user_id = drawn.user_id AND f.event_id = drawn.event_id
+    )
+""")
+
+
+async def insert_interests(conn: AsyncConnection, seed: int, roots: int, fanout: int,
+                           depth: int) -> Tuple[List[int], List[int]]:
+    all_ids: List[int] = []
+    level: List[Tuple[Optional[int], str]] = [(None, f"bench-{seed}-{i}") for i in range(1, roots + 1)]
+    leaves: List[int] = []
+    for current_depth in range(depth):
+        if not level:
+            break
+        rows = (await conn.execute(
+            insert(Interest).returning(Interest.id, Interest.parent_id, Interest.name),
+            [{"name": name, "parent_id": parent_id} for parent_id, name in level],
+        )).all()
+        for stmt in closure_insert_statements((row.id, row.parent_id) for row in rows):
+            await conn.execute(stmt)
+        all_ids.extend(row.id for row in rows)
+        if current_depth == depth - 1:
+            leaves.extend(row.id for row in rows)
+        level = [(row.id, f"{row.name}.{i}") for row in rows for i in range(1, fanout + 1)]
+    return all_ids, leaves or all_ids
+
+
+async def insert_range(statement, total: int, chunk_size: int, label: str, **params) -> None:
+    started = time.perf_counter()
+    for lo in range(1, total + 1, chunk_size):
+        hi = min(lo + chunk_size - 1, total)
+        async with engine.begin() as conn:
+            await conn.execute(statement, {"lo": lo, "hi": hi, **params})
+        print(f"{label}: {hi}/{total} ({time.perf_counter() - started:.1f}s)")
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        if args.clean:
+            for stmt in CLEANUP:
+                await conn.execute(stmt)
+        elif await conn.scalar(select(Interest.id).where(Interest.name.like(f"bench-{args.seed}-%")).limit(1)):
+            raise SystemExit(f"Seed {args.seed} is already generated, use --clean or another --seed")
+        interest_ids, leaf_ids = await insert_interests(
+            conn, args.seed, args.interest_roots, args.interest_fanout, args.interest_depth
+        )
+    print(f"interests: {len(interest_ids)} ({len(leaf_ids)} leaves)")
+
+    rng = random.Random(args.seed)
+    rng.shuffle(leaf_ids)
+    rng.shuffle(interest_ids)
+    seed = str(args.seed)
+    await insert_range(INSERT_EVENTS, args.events, args.chunk_size, "events", seed=seed)
+    await insert_range(INSERT_EVENT_INTERESTS, args.events, args.chunk_size, "event interests",
+                       seed=seed, interests=leaf_ids)
+    await insert_range(INSERT_DATE_LOCATIONS, args.events, args.chunk_size, "date locations",
+                       seed=seed, venues=args.venues)
+    await insert_range(UPDATE_OCCURRENCES, args.events, args.chunk_size, "occurrences", seed=seed)
+    await insert_range(INSERT_USERS, args.users, args.chunk_size, "users", seed=seed)
+    await insert_range(INSERT_USER_INTERESTS, args.users, args.chunk_size, "user interests",
+                       seed=seed, interests=interest_ids)
+    await insert_range(INSERT_FEEDBACK, args.feedback, args.chunk_size, "feedback",
+                       seed=seed, users=args.users, events=args.events)
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    await engine.dispose()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Fill the database with synthetic users, events and feedback")
+    arg_parser.add_argument("--users", type=int, default=10_000)
+    arg_parser.add_argument("--events", type=int, default=5_000)
+    arg_parser.add_argument("--feedback", type=int, default=200_000)
+    arg_parser.add_argument("--interest-roots", type=int, default=12)
+    arg_parser.add_argument("--interest-fanout", type=int, default=5)
+    arg_parser.add_argument("--interest-depth", type=int, default=3)
+    arg_parser.add_argument("--venues", type=int, default=500)
+    arg_parser.add_argument("--chunk-size", type=int, default=500_000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--clean", action="store_true",
+                            help="remove the rows of previous generator runs first, other data is kept")
+    asyncio.run(run(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import functools
+import json
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from domain.models import User
+from domain.services.algorithms import FilterAlgorithm
+from domain.services.interests import interest_registry
+from domain.services.recommendations import event_index, co_like_model
+from infra.db.session import engine, SessionLocal
+
+
+MODES = ("numpy", "index", "sql", "python")
+
+STAGES = (
+    "rank",
+    "load_events",
+    "_get_user_profile",
+    "_get_linked_user",
+    "_get_seen_event_ids",
+    "_get_all_interest_ids",
+    "_get_feedback_interest_ids",
+    "_get_collaborative_scores",
+    "_get_candidate_events",
+)
+
+SCAN_NODES = ("Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+
+
+class QueryLog:
+    def __init__(self):
+        self.count = 0
+        self.statements: List[Tuple[str, Any]] = []
+        self.capture = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+        if self.capture:
+            self.statements.append((statement, parameters))
+
+    @contextmanager
+    def capturing(self) -> Iterator[List[Tuple[str, Any]]]:
+        self.statements = []
+        self.capture = True
+        try:
+            yield self.statements
+        finally:
+            self.capture = False
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    if len(values) < 2:
+        values = values * 2 or [0.0, 0.0]
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": round(cuts[49] * 1000, 2), "p95": round(cuts[94] * 1000, 2), "p99": round(cuts[98] * 1000, 2)}
+
+
+def instrument(algorithm: FilterAlgorithm, timings: Dict[str, List[float]]) -> None:
+    for name in STAGES:
+        method = getattr(algorithm, name, None)
+        if method is None:
+            continue
+
+        @functools.wraps(method)
+        async def timed(*args, __method=method, __name=name, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await __method(*args, **kwargs)
+            finally:
+                timings[__name].append(time.perf_counter() - started)
+
+        setattr(algorithm, name, timed)
+
+
+def scanned_rows(plan: Dict[str, Any]) -> int:
+    rows = 0
+    if plan.get("Node Type") in SCAN_NODES:
+        loops = plan.get("Actual Loops", 1)
+        rows += (plan.get("Actual Rows", 0) + plan.get("Rows Removed by Filter", 0)) * loops
+    for child in plan.get("Plans", ()):
+        rows += scanned_rows(child)
+    return rows
+
+
+async def explain(conn: AsyncConnection, statements: List[Tuple[str, Any]]) -> int:
+    rows = 0
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            continue
+        result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters)
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        rows += scanned_rows(plan[0]["Plan"])
+    return rows
+
+
+async def sample_users(count: int, seed: float) -> List[UUID]:
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT setseed(:seed)"), {"seed": seed})
+        return list(await conn.scalars(select(User.id).order_by(text("random()")).limit(count)))
+
+
+async def bench_mode(mode: str, user_ids: List[UUID], args: argparse.Namespace, queries: QueryLog) -> Dict[str, Any]:
+    latencies: List[float] = []
+    query_counts: List[int] = []
+    timings: Dict[str, List[float]] = defaultdict(list)
+    rows_scanned: List[int] = []
+
+    for position, user_id in enumerate(user_ids[:args.warmup] + user_ids):
+        measured = position >= args.warmup
+        async with SessionLocal() as session:
+            user = await session.get(User, user_id)
+            algorithm = FilterAlgorithm(session, user)
+            if measured:
+                instrument(algorithm, timings)
+            explain_this = measured and position - args.warmup < args.explain
+            before = queries.count
+            started = time.perf_counter()
+            with queries.capturing() as statements:
+                await algorithm.filter(args.limit, mode=mode)
+            elapsed = time.perf_counter() - started
+            if not measured:
+                continue
+            latencies.append(elapsed)
+            query_counts.append(queries.count - before)
+            if explain_this:
+                rows_scanned.append(await explain(await session.connection(), statements))
+
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "latency_ms": percentiles(latencies),
+        "queries_per_request": round(statistics.mean(query_counts), 2) if query_counts else 0,
+        "rows_scanned_per_request": round(statistics.mean(rows_scanned)) if rows_scanned else None,
+        "stages_ms": {name: percentiles(values) for name, values in timings.items()},
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    latency = report["latency_ms"]
+    print(f"{report['mode']}: {report['requests']} requests, "
+          f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+          f"{report['queries_per_request']} queries/request, "
+          f"{report['rows_scanned_per_request']} rows scanned/request")
+    for name, stage in report["stages_ms"].items():
+        print(f"    {name}: p50 {stage['p50']} ms, p95 {stage['p95']} ms, p99 {stage['p99']} ms")
+
+
+async def run(args: argparse.Namespace) -> None:
+    queries = QueryLog()
+    event.listen(engine.sync_engine, "before_cursor_execute", queries)
+
+    started = time.perf_counter()
+    async with SessionLocal() as session:
+        await interest_registry.load(session)
+        await event_index.load(session)
+        await co_like_model.load(session)
+    warmup = {"load_seconds": round(time.perf_counter() - started, 3), "indexed_events": len(event_index)}
+    print(f"caches loaded in {warmup['load_seconds']}s ({warmup['indexed_events']} indexed events)")
+
+    user_ids = await sample_users(args.users, args.seed)
+    reports = []
+    for mode in args.mode or MODES:
+        report = await bench_mode(mode, user_ids, args, queries)
+        print_report(report)
+        reports.append(report)
+    await engine.dispose()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"warmup": warmup, "args": vars(args), "modes": reports}, file, indent=2)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Time FilterAlgorithm.filter end-to-end and per stage")
+    arg_parser.add_argument("--users", type=int, default=200, help="number of sampled users")
+    arg_parser.add_argument("--mode", choices=MODES, action="append", help="ranking mode, may be repeated")
+    arg_parser.add_argument("--limit", type=int, default=10)
+    arg_parser.add_argument("--warmup", type=int, default=5)
+    arg_parser.add_argument("--explain", type=int, default=20,
+                            help="requests per mode whose queries are re-run under EXPLAIN ANALYZE")
+    arg_parser.add_argument("--seed", type=float, default=0.5, help="user sampling seed in [-1, 1]")
+    arg_parser.add_argument("--output", help="write the report as JSON to this file")
+    asyncio.run(run(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from domain.services.algorithms import FilterAlgorithm
+from domain.services.recommendations import EventIndex, IndexedEvent, ScoringMatrix
+
+
+def synthesize_events(events: int, interests: int, seed: int, now: datetime) -> List[IndexedEvent]:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(events):
+        start = now + timedelta(minutes=rng.randint(-6 * 60, 30 * 24 * 60))
+        dates = tuple(sorted(start + timedelta(hours=3 * i) for i in range(rng.randint(1, 8))))
+        result.append(IndexedEvent(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            interest_ids=frozenset(rng.sample(range(1, interests + 1), rng.randint(1, 4))),
+            dates=dates,
+        ))
+    return result
+
+
+def python_top_k(index: EventIndex, limit, now, user_ids, liked, disliked, seen):
+    scored = []
+    for event_id in index.candidates(user_ids, now, now + timedelta(days=7)) - seen:
+        event = index.get_event(event_id)
+        score = FilterAlgorithm._score(event.interest_ids, event.next_date(now), user_ids, liked, disliked, now)
+        scored.append((event_id, score))
+    return sorted(scored, key=lambda x: (-x[1], x[0]))[:limit]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark index vs NumPy recommendation scoring")
+    arg_parser.add_argument("--events", type=int, default=100_000)
+    arg_parser.add_argument("--interests", type=int, default=200)
+    arg_parser.add_argument("--users", type=int, default=50)
+    arg_parser.add_argument("--limit", type=int, default=10)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    now = datetime.now().replace(microsecond=0)
+    events = synthesize_events(args.events, args.interests, args.seed, now)
+    index = EventIndex()
+    index.replace(events)
+
+    started = time.perf_counter()
+    matrix = ScoringMatrix.build(index.events())
+    print(f"{len(matrix)} events, matrix built in {time.perf_counter() - started:.3f}s")
+
+    rng = random.Random(args.seed + 1)
+    timings = {"python": [], "numpy": []}
+    for _ in range(args.users):
+        user_ids = set(rng.sample(range(1, args.interests + 1), rng.randint(1, 10)))
+        liked = set(rng.sample(range(1, args.interests + 1), 5))
+        disliked = set(rng.sample(range(1, args.interests + 1), 5))
+        seen = {event.id for event in rng.sample(events, 20)}
+
+        started = time.perf_counter()
+        expected = python_top_k(index, args.limit, now, user_ids, liked, disliked, seen)
+        timings["python"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        actual = matrix.top_k(args.limit, now, now + timedelta(days=7), user_ids, liked, disliked, seen)
+        timings["numpy"].append(time.perf_counter() - started)
+
+        if actual != expected:
+            raise SystemExit(f"results differ: {actual[:3]} != {expected[:3]}")
+
+    for name, values in timings.items():
+        values = sorted(values)
+        print(f"{name}: p50 {statistics.median(values) * 1000:.2f} ms, "
+              f"p95 {values[int(len(values) * 0.95) - 1] * 1000:.2f} ms over {len(values)} users")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 from .event import Event, UserEventFeedback, EventDateLocation
 from .users import User, Interest
+from .crawl import CrawlState
+from .interest_closure import InterestClosure
+from .co_likes import EventCoLike, UserLikeSnapshot
 
 __all__ = [
     "Event",
@@ -7,4 +10,8 @@ __all__ = [
     "User",
     "Interest",
     "EventDateLocation",
-]
\ No newline at end of file
+    "CrawlState",
+    "InterestClosure",
+    "EventCoLike",
+    "UserLikeSnapshot",
+]
@@ -0,0 +1,33 @@
+from sqlalchemy import Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from infra.db.base import Base
+
+
+class EventCoLike(Base):
+    __tablename__ = "event_co_likes"
+
+    event_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    other_event_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    likes: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<EventCoLike event_id={self.event_id} other_event_id={self.other_event_id} likes={self.likes}>"
+
+
+class UserLikeSnapshot(Base):
+    __tablename__ = "user_like_snapshot"
+
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    event_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    def __repr__(self):
+        return f"<UserLikeSnapshot user_id={self.user_id} event_id={self.event_id}>"
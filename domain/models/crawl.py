@@ -0,0 +1,21 @@
+from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from infra.db.base import Base
+from datetime import datetime
+from typing import Optional
+
+
+class CrawlState(Base):
+    __tablename__ = "crawl_state"
+
+    link: Mapped[str] = mapped_column(String(500), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(32), nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+    event_id: Mapped[Optional[UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("events.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+
+    def __repr__(self):
+        return f"<CrawlState link='{self.link}' event_id={self.event_id}>"
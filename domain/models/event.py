@@ -1,21 +1,36 @@
-from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Table, Column, UniqueConstraint, Text
+from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Table, Column, UniqueConstraint, Text, Computed, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.sql.expression import true
 from infra.db.base import Base
 from datetime import datetime
 from uuid import uuid4
+from typing import Optional
 
 
 class Event(Base):
     __tablename__ = "events"
-    __table_args__ = (UniqueConstraint("title", "description_hash", name="uq_event_title_description_hash"),)
+    __table_args__ = (
+        UniqueConstraint("title", "description_hash", name="uq_event_title_description_hash"),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     title: Mapped[str] = mapped_column(String(300), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     description_hash: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=true())
+    next_occurrence: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    last_occurrence: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     date_locations: Mapped[list["EventDateLocation"]] = relationship(
         back_populates="event",
@@ -34,17 +49,23 @@ class Event(Base):
         back_populates="event",
     )
 
+    def refresh_occurrences(self) -> None:
+        dates = [date_location.date for date_location in self.date_locations]
+        self.next_occurrence = min(dates, default=None)
+        self.last_occurrence = max(dates, default=None)
+
     def __repr__(self):
         return f"<Event id={self.id} title='{self.title}'>"
 
 
 class EventDateLocation(Base):
     __tablename__ = "event_date_locations"
+    __table_args__ = (UniqueConstraint("event_id", "date", "location", name="uq_event_date_location"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     event_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True),ForeignKey("events.id"), nullable=False)
 
-    date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     location: Mapped[str] = mapped_column(String(300), nullable=False)
 
     event: Mapped["Event"] = relationship(
@@ -71,5 +92,5 @@ event_interest_association  = Table(
     "event_interest_association",
     Base.metadata,
     Column("event_id", ForeignKey("events.id"), primary_key=True),
-    Column("interest_id", ForeignKey("interests.id"), primary_key=True),
+    Column("interest_id", ForeignKey("interests.id"), primary_key=True, index=True),
 )
\ No newline at end of file
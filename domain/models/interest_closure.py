@@ -0,0 +1,81 @@
+from sqlalchemy import Integer, ForeignKey, Column, select, delete, insert, values, event, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import Executable
+from infra.db.base import Base
+from typing import Iterable, List, Optional, Tuple
+from .users import Interest
+
+
+class InterestClosure(Base):
+    __tablename__ = "interest_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("interests.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("interests.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<InterestClosure ancestor_id={self.ancestor_id} descendant_id={self.descendant_id} depth={self.depth}>"
+
+
+def closure_insert_statements(interests: Iterable[Tuple[int, Optional[int]]]) -> List[Executable]:
+    rows = list(interests)
+    if not rows:
+        return []
+    closure = InterestClosure.__table__
+    statements: List[Executable] = [
+        pg_insert(closure)
+        .values([{"ancestor_id": interest_id, "descendant_id": interest_id, "depth": 0} for interest_id, _ in rows])
+        .on_conflict_do_nothing()
+    ]
+    with_parent = [(interest_id, parent_id) for interest_id, parent_id in rows if parent_id is not None]
+    if with_parent:
+        new_interests = values(
+            Column("id", Integer), Column("parent_id", Integer), name="new_interests"
+        ).data(with_parent)
+        statements.append(
+            pg_insert(closure)
+            .from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(closure.c.ancestor_id, new_interests.c.id, closure.c.depth + 1)
+                .join(new_interests, closure.c.descendant_id == new_interests.c.parent_id),
+            )
+            .on_conflict_do_nothing()
+        )
+    return statements
+
+
+def closure_move_statements(interest_id: int, parent_id: Optional[int]) -> List[Executable]:
+    closure = InterestClosure.__table__
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == interest_id)
+    detach = delete(closure).where(
+        closure.c.descendant_id.in_(subtree),
+        closure.c.ancestor_id.not_in(subtree),
+    )
+    if parent_id is None:
+        return [detach]
+    above = closure.alias("above")
+    below = closure.alias("below")
+    attach = insert(closure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+        .join(below, below.c.ancestor_id == interest_id)
+        .where(above.c.descendant_id == parent_id),
+    )
+    return [detach, attach]
+
+
+@event.listens_for(Interest, "after_insert")
+def _add_interest_to_closure(mapper, connection, target: Interest) -> None:
+    for stmt in closure_insert_statements([(target.id, target.parent_id)]):
+        connection.execute(stmt)
+
+
+@event.listens_for(Interest, "after_update")
+def _move_interest_in_closure(mapper, connection, target: Interest) -> None:
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    for stmt in closure_move_statements(target.id, target.parent_id):
+        connection.execute(stmt)
@@ -1,7 +1,9 @@
 from .users import UserCreate, UserRead, UserLogin, InterestAdd, InterestRead
 from .auth import Token
-from .events import EventCreate, EventRead
+from .events import EventCreate, EventRead, EventPage, PruneResult, RecommendationPage, EventSearchHit, EventSearchPage
 from .feedback import Feedback, FeedbackRead
+from .ingestion import IngestionReport
+from .jobs import IngestionJobRead
 
 __all__ = [
     "UserCreate",
@@ -12,6 +14,13 @@ __all__ = [
     "InterestRead",
     "EventCreate",
     "EventRead",
+    "EventPage",
+    "PruneResult",
+    "RecommendationPage",
+    "EventSearchHit",
+    "EventSearchPage",
     "Feedback",
     "FeedbackRead",
+    "IngestionReport",
+    "IngestionJobRead",
 ]
\ No newline at end of file
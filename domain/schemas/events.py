@@ -26,4 +26,30 @@ class EventRead(BaseModel):
     date_locations: List[EventDateLocationRead]
     interests: List[InterestRead]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class PruneResult(BaseModel):
+    date_locations_deleted: int = 0
+    events_deactivated: int = 0
+    events_reactivated: int = 0
+    events_deleted: int = 0
+    deleted_events: Optional[List[EventRead]] = None
+
+
+class EventPage(BaseModel):
+    items: List[EventRead]
+    next_cursor: Optional[UUID] = None
+
+
+class RecommendationPage(BaseModel):
+    items: List[EventRead]
+    next_cursor: Optional[str] = None
+
+
+class EventSearchHit(EventRead):
+    rank: float
+
+
+class EventSearchPage(BaseModel):
+    items: List[EventSearchHit]
+    next_cursor: Optional[str] = None
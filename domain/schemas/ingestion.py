@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class IngestionReport(BaseModel):
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.new + self.changed + self.unchanged
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+from .ingestion import IngestionReport
+
+
+class IngestionJobRead(BaseModel):
+    id: UUID
+    stage: str
+    trigger: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    stage_seconds: Dict[str, float] = Field(default_factory=dict)
+    report: IngestionReport
+    pages_fetched: int = 0
+    crawl_concurrency: Optional[int] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1 +1,5 @@
-from .events_service import EventParser
\ No newline at end of file
+from .events_service import EventParser
+from .http_client import AfishaHttpClient, ConnectionStats
+from .page_cache import PageCache, PageCacheStats
+from .concurrency import AdaptiveLimiter, LimiterStats
+from .sources import AfishaSource, ListingSelectors, AFISHA_SOURCES, get_sources, register_source
@@ -0,0 +1,129 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, AsyncIterator
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, *, base: float = 0.5, cap: float = 30.0,
+                  retry_after: Optional[float] = None) -> float:
+    if retry_after is not None:
+        return min(retry_after, cap * 4)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+@dataclass
+class LimiterStats:
+    successes: int = 0
+    throttled: int = 0
+    server_errors: int = 0
+    timeouts: int = 0
+    decreases: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "successes": self.successes,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "timeouts": self.timeouts,
+            "decreases": self.decreases,
+        }
+
+
+class AdaptiveLimiter:
+    def __init__(self,
+                 initial: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 50,
+                 latency_tolerance: float = 2.0,
+                 backoff_ratio: float = 0.5,
+                 smoothing: float = 0.2):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.smoothing = smoothing
+        self.stats = LimiterStats()
+        self.in_flight = 0
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._baseline_latency: Optional[float] = None
+        self._smoothed_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def current_limit(self) -> int:
+        return int(self._limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.current_limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        self.stats.successes += 1
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency
+            self._baseline_latency = latency
+        else:
+            self._smoothed_latency += self.smoothing * (latency - self._smoothed_latency)
+            self._baseline_latency = min(self._baseline_latency * 1.01, self._smoothed_latency)
+
+        if self._smoothed_latency > self._baseline_latency * self.latency_tolerance:
+            self._decrease(ratio=0.9)
+        else:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def record_throttled(self) -> None:
+        self.stats.throttled += 1
+        self._decrease()
+
+    def record_server_error(self) -> None:
+        self.stats.server_errors += 1
+        self._decrease()
+
+    def record_timeout(self) -> None:
+        self.stats.timeouts += 1
+        self._decrease()
+
+    def _decrease(self, ratio: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self._smoothed_latency or 0.0):
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * (ratio or self.backoff_ratio))
+        self.stats.decreases += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "current_limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "smoothed_latency": self._smoothed_latency,
+            "baseline_latency": self._baseline_latency,
+            **self.stats.as_dict(),
+        }
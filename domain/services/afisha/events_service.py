@@ -1,214 +1,266 @@
 import httpx
 import asyncio
-from datetime import datetime
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Any
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Dict, Optional, Any, AsyncIterator, Awaitable, Callable, TypeVar
 import logging
-import re
-from urllib.parse import urlparse
+import time
+from . import extractors
+from .concurrency import AdaptiveLimiter, backoff_delay, parse_retry_after
+from .http_client import AfishaHttpClient
+from .page_cache import PageCache
+from .sources import AfishaSource, source_from_url
+
+
+_STREAM_DONE = object()
+
+T = TypeVar("T")
 
 
 class EventParser:
-    def __init__(self, base_url: str = "https://afisha.relax.by/", timeout: int = 30):
+    def __init__(self, base_url: str = "https://afisha.relax.by/", timeout: int = 30,
+                 http_client: Optional[AfishaHttpClient] = None,
+                 concurrency: int = 20,
+                 max_concurrency: int = 40,
+                 limiter: Optional[AdaptiveLimiter] = None,
+                 queue_size: int = 100,
+                 page_cache: Optional[PageCache] = None,
+                 parse_executor: Optional[Executor] = None,
+                 parse_workers: Optional[int] = None,
+                 sources: Optional[List[AfishaSource]] = None):
         self.base_url = base_url
+        self.sources = sources or [source_from_url(base_url)]
         self.timeout = timeout
-        self.semaphore = asyncio.Semaphore(20)
+        self.queue_size = queue_size
+        self.limiter = limiter or AdaptiveLimiter(initial=concurrency, max_limit=max_concurrency)
+        self.http_client = http_client or AfishaHttpClient(timeout=timeout, max_connections=max_concurrency,
+                                                           max_keepalive_connections=max_concurrency)
+        self.page_cache = page_cache
+        self.parse_executor = parse_executor
+        self.parse_workers = parse_workers
+
+    async def __aenter__(self) -> "EventParser":
+        self.http_client.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.http_client.aclose()
+
+    @property
+    def current_concurrency(self) -> int:
+        return self.limiter.current_limit
+
+    async def fetch_with_limit(self, link: str) -> Dict[str, Any]:
+        return await self._limited(lambda: self.fetch_event_details(link))
+
+    async def _limited(self, fetch: Callable[[], Awaitable[T]]) -> T:
+        async with self.limiter.slot():
+            started = time.monotonic()
+            try:
+                result = await fetch()
+            except httpx.TimeoutException:
+                self.limiter.record_timeout()
+                raise
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429:
+                    self.limiter.record_throttled()
+                elif e.response.status_code >= 500:
+                    self.limiter.record_server_error()
+                raise
+            self.limiter.record_success(time.monotonic() - started)
+            return result
 
+    @staticmethod
+    def is_permanent_error(error: Exception) -> bool:
+        if not isinstance(error, httpx.HTTPStatusError):
+            return False
+        status_code = error.response.status_code
+        return 400 <= status_code < 500 and status_code != 429
 
-    async def fetch_with_semaphore(self, link: str, client: httpx.AsyncClient) -> Dict[str, Any]:
-        async with self.semaphore:
-            return await self.fetch_event_details(link, client)
+    @staticmethod
+    def retry_delay(attempt: int, error: Exception) -> float:
+        retry_after = None
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(error.response.headers.get("retry-after"))
+        return backoff_delay(attempt, retry_after=retry_after)
 
     async def fetch_html(self, url: str, retries: int = 5) -> Optional[str]:
         for attempt in range(1, retries + 1):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    return response.text
-            except (httpx.HTTPError, httpx.ReadTimeout):
-                if attempt == retries:
+                return await self._limited(lambda: self._get_text(url))
+            except (httpx.HTTPError, httpx.ReadTimeout) as e:
+                if attempt == retries or self.is_permanent_error(e):
                     raise
-                await asyncio.sleep(2)
+                await asyncio.sleep(self.retry_delay(attempt, e))
         return None
 
-    def get_parent_name_from_url(self) -> str:
-        path = urlparse(self.base_url).path
-        parts = path.strip("/").split("/")
-
-        category_map = {
-            "kino": "Movies",
-            "festivali": "Festivals",
-        }
-        if parts:
-            key = parts[0].lower()
-            return category_map.get(key, "Unknown")
-        return "Unknown"
+    async def _get_text(self, url: str) -> str:
+        response = await self.http_client.get(url)
+        response.raise_for_status()
+        return response.text
 
-    @staticmethod
-    def clean_text(text: str, *, filter_digits: bool = False) -> Optional[str]:
-        if not text:
-            return None
-        text = text.replace('\u200e', '')
-        text = re.sub(r"[\s-]*\d{4,}$", "", text).strip()
-        if filter_digits:
-            digits = sum(c.isdigit() for c in text)
-            if digits > 5 and re.fullmatch(r"[\d\s+\-()]*", text):
-                return None
-        return text or None
+    def get_parent_name_from_url(self) -> str:
+        return source_from_url(self.base_url).parent_interest
 
-    @staticmethod
-    def normalize_description(desc: Optional[str]) -> Optional[str]:
-        if not desc:
-            return None
-        return desc.strip().lower().replace('\n', ' ').replace('\r', '')
+    async def fetch_listing(self, source: AfishaSource) -> List[Dict[str, Any]]:
+        events = []
+        seen_links = set()
+        for page in range(1, source.max_pages + 1):
+            url = source.page_url(page)
+            try:
+                html = await self.fetch_html(url)
+            except httpx.HTTPError as e:
+                if page == 1:
+                    logging.warning(f"Failed to fetch listing of '{source.name}': {repr(e)}")
+                break
+            if not html:
+                break
 
-    @staticmethod
-    def parse_datetime_from_str(date_str: str) -> Optional[datetime]:
-        try:
-            date_part, time_part = date_str.split()
-            for sep in ['/', '.', '-', '_']:
-                time_part = time_part.replace(sep, ':')
-            dt_str = f"{date_part} {time_part}"
-            return datetime.strptime(dt_str, "%m/%d/%Y %H:%M")
-        except ValueError as e:
-            logging.warning(f"Failed to parse date_str='{date_str}': {e}")
-            return None
-
-    async def fetch_event_details(self, link: str, client: httpx.AsyncClient) -> Dict[str, Any]:
+            page_events = await self.run_extractor(self.extract_listing, html, source.selectors)
+            new_events = [event for event in page_events if event["link"] not in seen_links]
+            if not new_events:
+                break
+            for event in new_events:
+                seen_links.add(event["link"])
+                event["parent_interest"] = source.parent_interest
+                event["source"] = source.name
+            events.extend(new_events)
+        return events
+
+    async def fetch_listings(self) -> List[Dict[str, Any]]:
+        listings = await asyncio.gather(*(self.fetch_listing(source) for source in self.sources))
+        events = []
+        seen_links = set()
+        for source_events in listings:
+            for event in source_events:
+                if event["link"] in seen_links:
+                    continue
+                seen_links.add(event["link"])
+                events.append(event)
+        return events
+
+    clean_text = staticmethod(extractors.clean_text)
+    normalize_description = staticmethod(extractors.normalize_description)
+    parse_datetime_from_str = staticmethod(extractors.parse_datetime_from_str)
+    extract_listing = staticmethod(extractors.extract_listing)
+    extract_event_details = staticmethod(extractors.extract_event_details)
+
+    async def run_extractor(self, extractor: Callable[..., T], html: str, *args: Any) -> T:
+        if self.parse_executor is None:
+            return extractor(html, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_executor, extractor, html, *args)
+
+    async def fetch_event_details(self, link: str) -> Dict[str, Any]:
         try:
-            resp = await client.get(link)
+            cached = self.page_cache.get(link) if self.page_cache else None
+            resp = await self.http_client.get(link, headers=PageCache.conditional_headers(cached))
+            if cached and resp.status_code == 304:
+                return self.page_cache.hit(link, resp.headers, not_modified=True)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            desc_tag = soup.select_one("div.b-afisha_cinema_description_text")
-            description = desc_tag.text.strip() if desc_tag else None
-            normalized_description = self.normalize_description(description)
-
-            interests = list(filter(None, (
-                self.clean_text(a_tag.text.strip(), filter_digits=True)
-                for a_tag in soup.select("div.b-afisha_cinema_description_table a") if a_tag.text.strip()
-            )))
-
-            date_locations = []
-            time_tags = soup.select("a.schedule__seance-time")
-
-            for time_tag in time_tags:
-                date_raw = time_tag.get("data-date-format")
-                dt = self.parse_datetime_from_str(date_raw) if date_raw else None
-
-                schedule_item = time_tag.find_parent("div", class_="schedule__item")
-                if not schedule_item:
-                    schedule_wrap = time_tag.find_parent("div", class_="schedule__seance-wrap")
-                    schedule_seance = schedule_wrap.find_parent("div",
-                                                                class_="schedule__seance") if schedule_wrap else None
-                    schedule_item = schedule_seance or schedule_wrap
-
-                location = None
-                if schedule_item:
-                    place_tag = schedule_item.select_one("div.schedule__place a.schedule__place-link")
-                    address_tag = schedule_item.select_one("div.schedule__place span.text-black-light")
-                    if place_tag:
-                        place_name = place_tag.text.strip()
-                        address = address_tag.text.strip() if address_tag else None
-                        location = f"{place_name}, {address}" if address else place_name
-
-                if dt:
-                    location = (location or time_tag.get("data-category") or "Unknown location").strip()
-                    normalized_location = self.clean_text(location)
-                    date_locations.append({"date": dt, "location": normalized_location})
-
-            return {
-                "description": normalized_description,
-                "interests": interests,
-                "date_locations": date_locations
-            }
+
+            if self.page_cache is None:
+                return await self.run_extractor(self.extract_event_details, resp.text)
+
+            body_hash = PageCache.hash_body(resp.content)
+            if cached and cached.body_hash == body_hash:
+                return self.page_cache.hit(link, resp.headers, not_modified=False)
+            details = await self.run_extractor(self.extract_event_details, resp.text)
+            self.page_cache.put(link, resp.headers, body_hash, details)
+            return details
         except (httpx.HTTPError, httpx.RequestError, httpx.TimeoutException, AttributeError) as e:
             logging.warning(f"Failed to fetch details for {link}: {e}")
             raise
 
-    async def retry_request(self,retry_tasks: list,
-                            retry_events: list,
-                            client: httpx.AsyncClient,
-                            max_retries: int = 3) -> List[Any]:
-        filtered_events = []
-        for attempt in range(1, max_retries + 1):
-            retry_results = await asyncio.gather(*retry_tasks, return_exceptions=True)
-            retry_tasks = []
-            retry_events_next = []
-            for event, details in zip(retry_events, retry_results):
-                if isinstance(details, Exception):
-                    logging.warning(f"Retry failed for '{event['title']}': {repr(details)}")
-                    if attempt < max_retries:
-                        retry_tasks.append(self.fetch_with_semaphore(event["link"], client))
-                        retry_events_next.append(event)
-                else:
-                    event.update(details)
-                    filtered_events.append(event)
-            retry_events = retry_events_next
-            if not retry_events:
-                break
-        return filtered_events
-
-    async def parse_events_from_html(self, html: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
-        event_items = soup.select("div.b-afisha-layout_strap--item")
-
-        events = []
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            tasks = []
-            for item in event_items:
-                title_tag = item.select_one("a.b-afisha_blocks-strap_item_lnk_txt")
-                if not title_tag:
-                    continue
-
-                title = title_tag.text.strip()
-                link = title_tag.get("href")
-                if not title or not link:
-                    continue
+    async def fetch_details_with_retries(self, event: Dict[str, Any],
+                                         max_retries: int = 3) -> Optional[Dict[str, Any]]:
+        for attempt in range(max_retries + 1):
+            try:
+                return await self.fetch_with_limit(event["link"])
+            except Exception as e:
+                if self.is_permanent_error(e):
+                    logging.warning(f"Skipping event '{event['title']}': {repr(e)}")
+                    return None
+                if attempt == max_retries:
+                    logging.warning(f"Skipping event '{event['title']}' after {attempt + 1} attempts: {repr(e)}")
+                    return None
+                logging.warning(f"Retrying event '{event['title']}' due to error: {repr(e)}")
+                await asyncio.sleep(self.retry_delay(attempt + 1, e))
+        return None
 
-                img_tag = item.select_one("img")
-                img_url = img_tag.get("src") or img_tag.get("data-src") if img_tag else None
-
-                tasks.append(self.fetch_with_semaphore(link, client))
-
-                events.append({
-                    "title": title,
-                    "link": link,
-                    "img": img_url,
-                })
-
-            details_list = await asyncio.gather(*tasks, return_exceptions=True)
-
-            filtered_events = []
-            retry_tasks = []
-            retry_events = []
-            for event, details in zip(events, details_list):
-                if isinstance(details, Exception):
-                    logging.warning(f"Skipping event '{event['title']}' due to error: {repr(details)}")
-                    retry_tasks.append(self.fetch_with_semaphore(event["link"], client))
-                    retry_events.append(event)
-                else:
-                    event.update(details)
-                    filtered_events.append(event)
-            if retry_tasks:
-                retry = await self.retry_request(retry_tasks, retry_events, client)
-                filtered_events.extend(retry)
-
-            filtered_events = [event for event in filtered_events if event.get("date_locations")]
-            return filtered_events
+    async def _detail_worker(self, pending: asyncio.Queue, results: asyncio.Queue) -> None:
+        while True:
+            try:
+                event = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            details = await self.fetch_details_with_retries(event)
+            if details and details.get("date_locations"):
+                event.update(details)
+                await results.put(event)
+
+    async def stream_event_details(self, events: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        pending: asyncio.Queue = asyncio.Queue()
+        for event in events:
+            pending.put_nowait(event)
+        if pending.empty():
+            return
+
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        workers = [
+            asyncio.create_task(self._detail_worker(pending, results))
+            for _ in range(min(self.limiter.max_limit, pending.qsize()))
+        ]
+
+        async def close_when_done() -> None:
+            outcomes = await asyncio.gather(*workers, return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logging.error(f"Detail worker crashed: {repr(outcome)}")
+            await results.put(_STREAM_DONE)
+
+        closer = asyncio.create_task(close_when_done())
+        try:
+            while True:
+                event = await results.get()
+                if event is _STREAM_DONE:
+                    break
+                yield event
+        finally:
+            for task in (*workers, closer):
+                task.cancel()
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        owns_client = not self.http_client.is_open
+        self.http_client.open()
+        owns_executor = self.parse_executor is None and bool(self.parse_workers)
+        if owns_executor:
+            self.parse_executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        try:
+            events = await self.fetch_listings()
+            logging.info(f"Afisha listings: {len(events)} unique events across {len(self.sources)} sources")
+            async for event in self.stream_event_details(events):
+                yield event
+        finally:
+            logging.info(f"Afisha crawl connection stats: {self.http_client.stats.as_dict()}")
+            logging.info(f"Afisha crawl concurrency stats: {self.limiter.as_dict()}")
+            if self.page_cache:
+                await asyncio.to_thread(self.page_cache.save)
+                logging.info(f"Afisha page cache stats: {self.page_cache.stats.as_dict()}")
+            if owns_client:
+                await self.http_client.aclose()
+            if owns_executor:
+                self.parse_executor.shutdown(wait=False, cancel_futures=True)
+                self.parse_executor = None
 
     async def parse(self) -> List[Dict[str, Any]]:
-        main_html = await self.fetch_html(self.base_url)
-        if not main_html:
-            return []
-        return await self.parse_events_from_html(main_html)
+        return [event async for event in self.stream()]
 
 if __name__ == "__main__":
     async def main():
-        parser = EventParser()
-        events = await parser.parse()
-        for event in events:
+        from domain.services.afisha.sources import get_sources
+        parser = EventParser(sources=get_sources())
+        async for event in parser.stream():
             print(event)
+        print(parser.http_client.stats.as_dict())
 
     asyncio.run(main())
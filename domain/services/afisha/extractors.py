@@ -0,0 +1,171 @@
+from datetime import datetime
+from functools import lru_cache
+from lxml import etree, html as lxml_html
+from typing import List, Dict, Optional, Any
+import logging
+import re
+from .sources import ListingSelectors, has_class
+
+
+DEFAULT_LISTING_SELECTORS = ListingSelectors()
+
+DESCRIPTION = etree.XPath(f"(//div[{has_class('b-afisha_cinema_description_text')}])[1]")
+INTEREST_LINKS = etree.XPath(f"//div[{has_class('b-afisha_cinema_description_table')}]//a")
+SEANCE_TIMES = etree.XPath(f"//a[{has_class('schedule__seance-time')}]")
+SCHEDULE_ITEM = etree.XPath(f"ancestor::div[{has_class('schedule__item')}][1]")
+SCHEDULE_WRAP = etree.XPath(f"ancestor::div[{has_class('schedule__seance-wrap')}][1]")
+SCHEDULE_SEANCE = etree.XPath(f"ancestor::div[{has_class('schedule__seance')}][1]")
+PLACE_LINK = etree.XPath(
+    f"(.//div[{has_class('schedule__place')}]//a[{has_class('schedule__place-link')}])[1]"
+)
+PLACE_ADDRESS = etree.XPath(
+    f"(.//div[{has_class('schedule__place')}]//span[{has_class('text-black-light')}])[1]"
+)
+
+
+@lru_cache(maxsize=4096)
+def clean_text(text: str, *, filter_digits: bool = False) -> Optional[str]:
+    if not text:
+        return None
+    text = text.replace('\u200e', '')
+    text = re.sub(r"[\s-]*\d{4,}$", "", text).strip()
+    if filter_digits:
+        digits = sum(c.isdigit() for c in text)
+        if digits > 5 and re.fullmatch(r"[\d\s+\-()]*", text):
+            return None
+    return text or None
+
+
+def normalize_description(desc: Optional[str]) -> Optional[str]:
+    if not desc:
+        return None
+    return desc.strip().lower().replace('\n', ' ').replace('\r', '')
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime_from_str(date_str: str) -> Optional[datetime]:
+    try:
+        date_part, time_part = date_str.split()
+        for sep in ['/', '.', '-', '_']:
+            time_part = time_part.replace(sep, ':')
+        dt_str = f"{date_part} {time_part}"
+        return datetime.strptime(dt_str, "%m/%d/%Y %H:%M")
+    except ValueError as e:
+        logging.warning(f"Failed to parse date_str='{date_str}': {e}")
+        return None
+
+
+def _first(xpath: etree.XPath, element: etree._Element) -> Optional[etree._Element]:
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def _text(element: etree._Element) -> str:
+    return element.text_content().strip()
+
+
+def _parse_document(html: str) -> Optional[etree._Element]:
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        return lxml_html.document_fromstring(html.encode("utf-8"))
+
+
+def _find_venue(time_tag: etree._Element) -> Optional[etree._Element]:
+    schedule_item = _first(SCHEDULE_ITEM, time_tag)
+    if schedule_item is None:
+        schedule_wrap = _first(SCHEDULE_WRAP, time_tag)
+        schedule_seance = _first(SCHEDULE_SEANCE, schedule_wrap) if schedule_wrap is not None else None
+        schedule_item = schedule_seance if schedule_seance is not None else schedule_wrap
+    return schedule_item
+
+
+def _venue_location(schedule_item: etree._Element) -> Optional[str]:
+    place_tag = _first(PLACE_LINK, schedule_item)
+    if place_tag is None:
+        return None
+    address_tag = _first(PLACE_ADDRESS, schedule_item)
+    place_name = _text(place_tag)
+    address = _text(address_tag) if address_tag is not None else None
+    return f"{place_name}, {address}" if address else place_name
+
+
+@lru_cache(maxsize=256)
+def _compile(expression: str) -> etree.XPath:
+    return etree.XPath(expression)
+
+
+def extract_listing(html: str, selectors: ListingSelectors = DEFAULT_LISTING_SELECTORS) -> List[Dict[str, Any]]:
+    root = _parse_document(html)
+    if root is None:
+        return []
+
+    title_xpath = _compile(selectors.title)
+    img_xpath = _compile(selectors.img)
+    events = []
+    try:
+        for item in _compile(selectors.item)(root):
+            title_tag = _first(title_xpath, item)
+            if title_tag is None:
+                continue
+
+            title = _text(title_tag)
+            link = title_tag.get("href")
+            if not title or not link:
+                continue
+
+            img_tag = _first(img_xpath, item)
+            img_url = img_tag.get("src") or img_tag.get("data-src") if img_tag is not None else None
+
+            events.append({
+                "title": title,
+                "link": link,
+                "img": img_url,
+            })
+    finally:
+        root.clear()
+    return events
+
+
+def extract_event_details(html: str) -> Dict[str, Any]:
+    root = _parse_document(html)
+    if root is None:
+        return {"description": None, "interests": [], "date_locations": []}
+
+    try:
+        desc_tag = _first(DESCRIPTION, root)
+        description = _text(desc_tag) if desc_tag is not None else None
+        normalized_description = normalize_description(description)
+
+        interests = list(filter(None, (
+            clean_text(text, filter_digits=True)
+            for text in (_text(a_tag) for a_tag in INTEREST_LINKS(root)) if text
+        )))
+
+        date_locations = []
+        venue_locations = {}
+        for time_tag in SEANCE_TIMES(root):
+            date_raw = time_tag.get("data-date-format")
+            dt = parse_datetime_from_str(date_raw) if date_raw else None
+            if not dt:
+                continue
+
+            schedule_item = _find_venue(time_tag)
+            location = None
+            if schedule_item is not None:
+                if schedule_item not in venue_locations:
+                    venue_locations[schedule_item] = _venue_location(schedule_item)
+                location = venue_locations[schedule_item]
+
+            location = (location or time_tag.get("data-category") or "Unknown location").strip()
+            date_locations.append({"date": dt, "location": clean_text(location)})
+    finally:
+        root.clear()
+
+    return {
+        "description": normalized_description,
+        "interests": interests,
+        "date_locations": date_locations
+    }
@@ -0,0 +1,74 @@
+import httpx
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+
+@dataclass
+class ConnectionStats:
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        return self.requests - self.connections_opened
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+        }
+
+
+class AfishaHttpClient:
+    def __init__(self,
+                 timeout: int = 30,
+                 http2: bool = True,
+                 max_connections: int = 20,
+                 max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0):
+        self.timeout = timeout
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.stats = ConnectionStats()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    def open(self) -> httpx.AsyncClient:
+        if not self.is_open:
+            self._client = httpx.AsyncClient(timeout=self.timeout, http2=self.http2, limits=self.limits)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        client = self.open()
+        opened = False
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal opened
+            if event_name == "connection.connect_tcp.complete":
+                opened = True
+
+        response = await client.get(url, headers=headers, extensions={"trace": trace})
+        self.stats.requests += 1
+        if opened:
+            self.stats.connections_opened += 1
+        return response
+
+    async def __aenter__(self) -> "AfishaHttpClient":
+        self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
@@ -0,0 +1,153 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class PageCacheStats:
+    not_modified: int = 0
+    unchanged: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.not_modified + self.unchanged
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+@dataclass
+class CachedPage:
+    body_hash: str
+    result: Dict[str, Any]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    seen_at: float = field(default_factory=time.time)
+
+
+class PageCache:
+    def __init__(self, path: str, max_age_days: int = 30):
+        self.path = path
+        self.max_age = max_age_days * 24 * 3600
+        self.stats = PageCacheStats()
+        self._entries: Optional[Dict[str, CachedPage]] = None
+
+    @staticmethod
+    def hash_body(body: bytes) -> str:
+        return hashlib.sha1(body).hexdigest()
+
+    @property
+    def entries(self) -> Dict[str, CachedPage]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        return self.entries.get(url)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedPage]) -> Dict[str, str]:
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def hit(self, url: str, headers, *, not_modified: bool) -> Dict[str, Any]:
+        entry = self.entries[url]
+        entry.etag = headers.get("etag") or entry.etag
+        entry.last_modified = headers.get("last-modified") or entry.last_modified
+        entry.seen_at = time.time()
+        if not_modified:
+            self.stats.not_modified += 1
+        else:
+            self.stats.unchanged += 1
+        return copy.deepcopy(entry.result)
+
+    def put(self, url: str, headers, body_hash: str, result: Dict[str, Any]) -> None:
+        self.stats.misses += 1
+        self.entries[url] = CachedPage(
+            body_hash=body_hash,
+            result=copy.deepcopy(result),
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+
+    def save(self) -> None:
+        if self._entries is None:
+            return
+        expire_before = time.time() - self.max_age
+        data = {
+            url: {
+                "body_hash": entry.body_hash,
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+                "seen_at": entry.seen_at,
+                "result": self._dump_result(entry.result),
+            }
+            for url, entry in self._entries.items() if entry.seen_at >= expire_before
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> Dict[str, CachedPage]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                url: CachedPage(
+                    body_hash=item["body_hash"],
+                    result=self._load_result(item["result"]),
+                    etag=item.get("etag"),
+                    last_modified=item.get("last_modified"),
+                    seen_at=item.get("seen_at", 0.0),
+                )
+                for url, item in data.items()
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable page cache {self.path}: {e}")
+            return {}
+
+    @staticmethod
+    def _dump_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        dumped = dict(result)
+        dumped["date_locations"] = [
+            {"date": dl["date"].isoformat(), "location": dl["location"]}
+            for dl in result.get("date_locations", [])
+        ]
+        return dumped
+
+    @staticmethod
+    def _load_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        loaded = dict(result)
+        loaded["date_locations"] = [
+            {"date": datetime.fromisoformat(dl["date"]), "location": dl["location"]}
+            for dl in result.get("date_locations", [])
+        ]
+        return loaded
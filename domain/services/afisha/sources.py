@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List
+from urllib.parse import urlparse
+import httpx
+
+
+def has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+@dataclass(frozen=True)
+class ListingSelectors:
+    item: str = f"//div[{has_class('b-afisha-layout_strap--item')}]"
+    title: str = f"(.//a[{has_class('b-afisha_blocks-strap_item_lnk_txt')}])[1]"
+    img: str = "(.//img)[1]"
+
+
+@dataclass(frozen=True)
+class AfishaSource:
+    name: str
+    url: str
+    parent_interest: str
+    max_pages: int = 1
+    page_param: Optional[str] = "page"
+    selectors: ListingSelectors = field(default_factory=ListingSelectors)
+
+    def page_url(self, page: int) -> str:
+        if page <= 1 or not self.page_param:
+            return self.url
+        return str(httpx.URL(self.url).copy_merge_params({self.page_param: page}))
+
+
+AFISHA_SOURCES: Dict[str, AfishaSource] = {
+    source.name: source for source in (
+        AfishaSource("kino", "https://afisha.relax.by/kino/minsk/", "Movies", max_pages=5),
+        AfishaSource("festivali", "https://afisha.relax.by/festivali/minsk/", "Festivals", max_pages=3),
+        AfishaSource("conserts", "https://afisha.relax.by/conserts/minsk/", "Music", max_pages=5),
+        AfishaSource("theatre", "https://afisha.relax.by/theatre/minsk/", "Theater", max_pages=5),
+        AfishaSource("kids", "https://afisha.relax.by/kids/minsk/", "Kids Activities", max_pages=3),
+        AfishaSource("expo", "https://afisha.relax.by/expo/minsk/", "Art", max_pages=3),
+        AfishaSource("sport", "https://afisha.relax.by/sport/minsk/", "Sports", max_pages=3),
+    )
+}
+
+
+def register_source(source: AfishaSource) -> None:
+    AFISHA_SOURCES[source.name] = source
+
+
+def get_sources(names: Optional[List[str]] = None) -> List[AfishaSource]:
+    if names is None:
+        return list(AFISHA_SOURCES.values())
+    return [AFISHA_SOURCES[name] for name in names]
+
+
+def source_from_url(url: str) -> AfishaSource:
+    parts = urlparse(url).path.strip("/").split("/")
+    key = parts[0].lower() if parts else ""
+    known = AFISHA_SOURCES.get(key)
+    parent_interest = known.parent_interest if known else "Unknown"
+    return AfishaSource(key or "default", url, parent_interest)
@@ -1 +1,2 @@
-from .filter import FilterAlgorithm
\ No newline at end of file
+from .filter import FilterAlgorithm, RankingMode
+from .batch import BatchRecommender, BatchResult, UserProfile
\ No newline at end of file
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.models import User, UserEventFeedback, InterestClosure
+from domain.models.event import event_interest_association
+from domain.models.users import user_interest_association
+from domain.services.recommendations import event_index, scoring_engine, co_like_model, ScoringMatrix, CoLikeModel
+from infra.config.app_settings import settings
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    user_id: UUID
+    interest_ids: Set[int] = field(default_factory=set)
+    liked_interest_ids: Set[int] = field(default_factory=set)
+    disliked_interest_ids: Set[int] = field(default_factory=set)
+    seen_event_ids: Set[UUID] = field(default_factory=set)
+    liked_event_ids: Set[UUID] = field(default_factory=set)
+
+
+@dataclass
+class BatchResult:
+    recommendations: Dict[UUID, List[Tuple[UUID, int]]] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def users(self) -> int:
+        return len(self.recommendations)
+
+    @property
+    def users_per_second(self) -> float:
+        return round(self.users / self.seconds, 1) if self.seconds else 0.0
+
+
+class BatchRecommender:
+    def __init__(self, session: AsyncSession, limit: int = 10, chunk_size: int = 500,
+                 workers: Optional[int] = None):
+        self.session = session
+        self.limit = limit
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    async def recommend(self, user_ids: Optional[Sequence[UUID]] = None,
+                        now: Optional[datetime] = None) -> BatchResult:
+        started = time.perf_counter()
+        now = now or datetime.now()
+        if user_ids is None:
+            user_ids = list(await self.session.scalars(select(User.id).order_by(User.id)))
+        await event_index.get(self.session)
+        matrix = await scoring_engine.matrix()
+        co_likes = await co_like_model.get(self.session) if settings.RECOMMENDATION_COLIKE_WEIGHT > 0 else None
+
+        result = BatchResult()
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = []
+            for start in range(0, len(user_ids), self.chunk_size):
+                profiles = await self.load_profiles(user_ids[start:start + self.chunk_size])
+                pending.append(loop.run_in_executor(pool, self._score_chunk, matrix, co_likes, profiles, now))
+            for chunk in await asyncio.gather(*pending):
+                result.recommendations.update(chunk)
+        result.seconds = round(time.perf_counter() - started, 3)
+        return result
+
+    async def load_profiles(self, user_ids: Sequence[UUID]) -> List[UserProfile]:
+        uia = user_interest_association
+        eia = event_interest_association
+        profiles = {user_id: UserProfile(user_id) for user_id in user_ids}
+
+        interests_stmt = (
+            select(uia.c.user_id, InterestClosure.descendant_id)
+            .join(InterestClosure, InterestClosure.ancestor_id == uia.c.interest_id)
+            .where(uia.c.user_id.in_(user_ids))
+        )
+        for user_id, interest_id in await self.session.execute(interests_stmt):
+            profiles[user_id].interest_ids.add(interest_id)
+
+        seen_stmt = (
+            select(UserEventFeedback.user_id, UserEventFeedback.event_id, UserEventFeedback.like)
+            .where(UserEventFeedback.user_id.in_(user_ids))
+        )
+        for user_id, event_id, like in await self.session.execute(seen_stmt):
+            profiles[user_id].seen_event_ids.add(event_id)
+            if like:
+                profiles[user_id].liked_event_ids.add(event_id)
+
+        feedback_stmt = (
+            select(UserEventFeedback.user_id, UserEventFeedback.like, eia.c.interest_id)
+            .join(eia, eia.c.event_id == UserEventFeedback.event_id)
+            .where(UserEventFeedback.user_id.in_(user_ids))
+        )
+        for user_id, like, interest_id in await self.session.execute(feedback_stmt):
+            profile = profiles[user_id]
+            (profile.liked_interest_ids if like else profile.disliked_interest_ids).add(interest_id)
+        return list(profiles.values())
+
+    def _score_chunk(self, matrix: ScoringMatrix, co_likes: Optional[CoLikeModel], profiles: List[UserProfile],
+                     now: datetime) -> Dict[UUID, List[Tuple[UUID, int]]]:
+        date_limit = now + timedelta(days=7)
+        recommendations = {}
+        for profile in profiles:
+            boosts = co_likes.scores(profile.liked_event_ids, settings.RECOMMENDATION_COLIKE_WEIGHT,
+                                     settings.RECOMMENDATION_COLIKE_CAP) if co_likes else None
+            recommendations[profile.user_id] = matrix.top_k(
+                self.limit, now, date_limit, profile.interest_ids, profile.liked_interest_ids,
+                profile.disliked_interest_ids, profile.seen_event_ids, boosts,
+            )
+        return recommendations
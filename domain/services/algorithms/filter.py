@@ -1,11 +1,24 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists, func, case, desc, or_, and_, Select
 from sqlalchemy.orm import selectinload
 
-from domain.models import User, Event, Interest, UserEventFeedback, EventDateLocation
-from domain.schemas import EventRead
-from typing import Optional, List
+from domain.models import User, Event, Interest, UserEventFeedback, EventDateLocation, InterestClosure, EventCoLike
+from domain.models.event import event_interest_association
+from domain.models.users import user_interest_association
+from domain.schemas import EventRead, RecommendationPage
+from domain.services.interests import interest_registry
+from domain.services.recommendations import (
+    event_index, scoring_engine, recommendation_cache, co_like_model, RankedSnapshot, RecommendationCursor, RankKey,
+)
+from domain import exeptions
+from infra.config.app_settings import settings
+from typing import Optional, List, Tuple, Literal, AbstractSet, Iterable, Dict
 from datetime import datetime, timedelta
+from uuid import UUID
+import heapq
+
+
+RankingMode = Literal["numpy", "index", "sql", "python"]
 
 
 class FilterAlgorithm:
@@ -13,20 +26,230 @@ class FilterAlgorithm:
         self.session = session
         self.user = user
 
-    async def filter(self, limit: int = 10) -> List[EventRead]:
-        now = datetime.now()
+    async def filter(self, limit: int = 10, mode: RankingMode = "numpy") -> List[EventRead]:
+        return await self.load_events(await self.rank(limit, mode))
+
+    async def rank(self, limit: int = 10, mode: RankingMode = "numpy", now: Optional[datetime] = None,
+                   after: Optional[RankKey] = None) -> List[Tuple[UUID, int]]:
+        if mode == "numpy":
+            return await self.get_top_scored_ids_vectorized(limit, now, after)
+        if mode == "index":
+            return await self.get_top_scored_ids_from_index(limit, now, after)
+        if mode == "sql":
+            return await self.get_top_scored_ids(limit, now, after)
+        return await self.get_top_scored_ids_in_python(limit, now, after)
+
+    async def get_top_scored_ids_in_python(self, limit: int = 10, now: Optional[datetime] = None,
+                                           after: Optional[RankKey] = None) -> List[Tuple[UUID, int]]:
+        now = now or datetime.now()
 
         user = await self._get_linked_user()
         seen_event_ids = await self._get_seen_event_ids(user)
         user_interest_ids = await self._get_all_interest_ids(user)
         liked_ids, disliked_ids = await self._get_feedback_interest_ids(user)
 
+        collaborative = await self._get_collaborative_scores()
+
         candidate_events = await self._get_candidate_events(user_interest_ids, seen_event_ids, now)
         scored_events = self._score_events(candidate_events, user_interest_ids, liked_ids, disliked_ids, now)
+        return self.top_k(
+            ((e["event"].id, e["score"] + collaborative.get(e["event"].id, 0)) for e in scored_events), limit, after
+        )
+
+    async def page(self, limit: int = 10, cursor: Optional[str] = None,
+                   mode: RankingMode = "numpy") -> RecommendationPage:
+        try:
+            position = RecommendationCursor.decode(cursor) if cursor else None
+        except (ValueError, TypeError):
+            raise exeptions.BadRequestException("Invalid cursor")
+
+        scored_ids: List[Tuple[UUID, int]] = []
+        while True:
+            snapshot = await self._get_snapshot(mode, position.after if position else None)
+            try:
+                items, position = snapshot.page(limit - len(scored_ids), position)
+            except ValueError:
+                raise exeptions.BadRequestException("Invalid cursor")
+            scored_ids.extend(items)
+            if position is None or len(scored_ids) >= limit:
+                break
+        return RecommendationPage(
+            items=await self.load_events(scored_ids),
+            next_cursor=position.encode() if position else None,
+        )
+
+    async def _get_snapshot(self, mode: RankingMode, after: Optional[RankKey]) -> RankedSnapshot:
+        async def build_snapshot() -> RankedSnapshot:
+            size = settings.RECOMMENDATION_SNAPSHOT_SIZE
+            ranked = tuple(await self.rank(size, mode, after=after))
+            return RankedSnapshot(ranked, after, complete=len(ranked) < size)
+
+        params = mode if after is None else (mode, after)
+        return await recommendation_cache.get_or_compute(self.user.id, params, build_snapshot)
+
+    @staticmethod
+    def top_k(scored_ids: Iterable[Tuple[UUID, int]], limit: int,
+              after: Optional[RankKey] = None) -> List[Tuple[UUID, int]]:
+        if after is not None:
+            bound = (-after[0], after[1])
+            scored_ids = (x for x in scored_ids if (-x[1], x[0]) > bound)
+        return heapq.nsmallest(limit, scored_ids, key=lambda x: (-x[1], x[0]))
+
+    async def _get_user_profile(self) -> Tuple[set[UUID], set[int], set[int], set[int]]:
+        catalogue = await interest_registry.get(self.session)
+        user = await self._get_linked_user()
+        seen_event_ids = await self._get_seen_event_ids(user)
+        user_interest_ids = catalogue.with_descendants(i.id for i in user.interests)
+        liked_ids, disliked_ids = await self._get_feedback_interest_ids(user)
+        return seen_event_ids, user_interest_ids, liked_ids, disliked_ids
+
+    async def _get_collaborative_scores(self) -> Dict[UUID, int]:
+        if settings.RECOMMENDATION_COLIKE_WEIGHT <= 0:
+            return {}
+        stmt = select(UserEventFeedback.event_id).where(
+            UserEventFeedback.user_id == self.user.id,
+            UserEventFeedback.like.is_(True),
+        )
+        liked_event_ids = set(await self.session.scalars(stmt))
+        if not liked_event_ids:
+            return {}
+        model = await co_like_model.get(self.session)
+        return model.scores(liked_event_ids, settings.RECOMMENDATION_COLIKE_WEIGHT, settings.RECOMMENDATION_COLIKE_CAP)
+
+    async def get_top_scored_ids_vectorized(self, limit: int = 10, now: Optional[datetime] = None,
+                                            after: Optional[RankKey] = None) -> List[Tuple[UUID, int]]:
+        now = now or datetime.now()
+        await event_index.get(self.session)
+        seen_event_ids, user_interest_ids, liked_ids, disliked_ids = await self._get_user_profile()
+        collaborative = await self._get_collaborative_scores()
+        matrix = await scoring_engine.matrix()
+        return matrix.top_k(limit, now, now + timedelta(days=7), user_interest_ids,
+                            liked_ids, disliked_ids, seen_event_ids, collaborative, after)
+
+    async def get_top_scored_ids_from_index(self, limit: int = 10, now: Optional[datetime] = None,
+                                            after: Optional[RankKey] = None) -> List[Tuple[UUID, int]]:
+        now = now or datetime.now()
+        index = await event_index.get(self.session)
+        seen_event_ids, user_interest_ids, liked_ids, disliked_ids = await self._get_user_profile()
+        collaborative = await self._get_collaborative_scores()
+
+        candidate_ids = index.candidates(user_interest_ids, now, now + timedelta(days=7)) - seen_event_ids
+        scored = []
+        for event_id in candidate_ids:
+            event = index.get_event(event_id)
+            score = self._score(event.interest_ids, event.next_date(now), user_interest_ids,
+                                liked_ids, disliked_ids, now)
+            scored.append((event_id, score + collaborative.get(event_id, 0)))
+        return self.top_k(scored, limit, after)
+
+    async def load_events(self, scored_ids: List[Tuple[UUID, int]]) -> List[EventRead]:
+        if not scored_ids:
+            return []
+        stmt = select(Event).where(Event.id.in_([event_id for event_id, _ in scored_ids])).options(
+            selectinload(Event.date_locations),
+            selectinload(Event.interests),
+        )
+        events = {event.id: event for event in (await self.session.scalars(stmt)).all()}
+        return list(EventRead.model_validate(events[event_id]) for event_id, _ in scored_ids if event_id in events)
+
+    async def get_top_scored_ids(self, limit: int = 10, now: Optional[datetime] = None,
+                                 after: Optional[RankKey] = None) -> List[Tuple[UUID, int]]:
+        stmt = self._scoring_stmt(self.user.id, now or datetime.now(), limit, after)
+        result = await self.session.execute(stmt)
+        return [(row.id, row.score) for row in result]
+
+    @staticmethod
+    def _scoring_stmt(user_id: UUID, now: datetime, limit: int, after: Optional[RankKey] = None) -> Select:
+        date_limit = now + timedelta(days=7)
+        uia = user_interest_association
+        eia = event_interest_association
+
+        user_interests = (
+            select(InterestClosure.descendant_id.label("id"))
+            .join(uia, InterestClosure.ancestor_id == uia.c.interest_id)
+            .where(uia.c.user_id == user_id)
+            .distinct()
+            .cte("user_interests")
+        )
+
+        seen = (
+            select(UserEventFeedback.event_id, UserEventFeedback.like)
+            .where(UserEventFeedback.user_id == user_id)
+            .cte("seen")
+        )
+
+        feedback_interests = (
+            select(
+                eia.c.interest_id,
+                func.bool_or(seen.c.like.is_(True)).label("liked"),
+                func.bool_or(seen.c.like.is_not(True)).label("disliked"),
+            )
+            .join(seen, seen.c.event_id == eia.c.event_id)
+            .group_by(eia.c.interest_id)
+            .cte("feedback_interests")
+        )
+
+        next_date = case(
+            (Event.next_occurrence >= now, Event.next_occurrence),
+            else_=(
+                select(func.min(EventDateLocation.date))
+                .where(EventDateLocation.event_id == Event.id, EventDateLocation.date >= now)
+                .scalar_subquery()
+            ),
+        )
+        candidates = (
+            select(Event.id, next_date.label("next_date"))
+            .where(
+                Event.is_active.is_(True),
+                Event.last_occurrence >= now,
+                Event.next_occurrence <= date_limit,
+                ~exists().where(seen.c.event_id == Event.id),
+                exists().where(eia.c.event_id == Event.id, eia.c.interest_id.in_(select(user_interests.c.id))),
+            )
+            .cte("candidates")
+        )
 
-        top_n = sorted(scored_events, key=lambda x: x["score"], reverse=True)[:limit]
-        recommended_events = [e["event"] for e in top_n]
-        return list(EventRead.model_validate(event) for event in recommended_events)
+        date_score = case(
+            (candidates.c.next_date < now + timedelta(hours=1), -2),
+            (candidates.c.next_date <= now + timedelta(hours=3), 3),
+            (candidates.c.next_date <= now + timedelta(hours=24), 1),
+            else_=0,
+        )
+        score = (
+            func.count(user_interests.c.id) * 3
+            + date_score
+            + case((func.bool_or(feedback_interests.c.liked), 2), else_=0)
+            - case((func.bool_or(feedback_interests.c.disliked), 3), else_=0)
+        )
+        co_likes = None
+        if settings.RECOMMENDATION_COLIKE_WEIGHT > 0:
+            co_likes = (
+                select(
+                    EventCoLike.other_event_id.label("event_id"),
+                    (func.least(func.sum(EventCoLike.likes), settings.RECOMMENDATION_COLIKE_CAP)
+                     * settings.RECOMMENDATION_COLIKE_WEIGHT).label("score"),
+                )
+                .where(EventCoLike.event_id.in_(select(seen.c.event_id).where(seen.c.like.is_(True))))
+                .group_by(EventCoLike.other_event_id)
+                .cte("co_likes")
+            )
+            score = score + func.coalesce(co_likes.c.score, 0)
+
+        stmt = (
+            select(candidates.c.id, score.label("score"))
+            .join(eia, eia.c.event_id == candidates.c.id)
+            .outerjoin(user_interests, user_interests.c.id == eia.c.interest_id)
+            .outerjoin(feedback_interests, feedback_interests.c.interest_id == eia.c.interest_id)
+            .group_by(candidates.c.id, candidates.c.next_date)
+            .order_by(desc("score"), candidates.c.id)
+            .limit(limit)
+        )
+        if co_likes is not None:
+            stmt = stmt.outerjoin(co_likes, co_likes.c.event_id == candidates.c.id).group_by(co_likes.c.score)
+        if after is not None:
+            after_score, after_id = after
+            stmt = stmt.having(or_(score < after_score, and_(score == after_score, candidates.c.id > after_id)))
+        return stmt
 
     async def _get_linked_user(self) -> User:
         smtm = select(User).where(User.id == self.user.id).options(
@@ -42,9 +265,11 @@ class FilterAlgorithm:
 
     async def _get_all_interest_ids(self, user: User) -> set[int]:
         ids = {i.id for i in user.interests}
-        for interest in user.interests:
-            await self.session.refresh(interest, attribute_names=["children"]) # type: ignore
-            ids.update(child.id for child in interest.children) # type: ignore
+        if not ids:
+            return ids
+        stmt = select(InterestClosure.descendant_id).where(InterestClosure.ancestor_id.in_(ids))
+        result = await self.session.execute(stmt)
+        ids.update(row[0] for row in result)
         return ids
 
     async def _get_feedback_interest_ids(self, user: User) -> tuple[set[int], set[int]]:
@@ -70,13 +295,6 @@ class FilterAlgorithm:
                 disliked.add(interest_id)
         return liked, disliked
 
-    async def _get_linked_events(self, user: User) -> Optional[List[Event]]:
-        smtm = select(Event).where(Event.feedback == user.feedback).options(
-            selectinload(Event.feedback),
-        )
-        result = await self.session.execute(smtm)
-        return list(result.scalars().all())
-
     async def _get_candidate_events(self, interest_ids: set[int], exclude_ids: set, now: datetime) -> List[Event]:
         date_limit = now + timedelta(days=7)
 
@@ -85,8 +303,8 @@ class FilterAlgorithm:
             .where(
                 Event.is_active == True,
                 ~Event.id.in_(exclude_ids),
-                Event.date_locations.any(EventDateLocation.date >= now),
-                Event.date_locations.any(EventDateLocation.date <= date_limit),
+                Event.last_occurrence >= now,
+                Event.next_occurrence <= date_limit,
                 Event.interests.any(Interest.id.in_(interest_ids)),
             )
             .options(
@@ -99,7 +317,34 @@ class FilterAlgorithm:
         return list(result.scalars().all())
 
     @staticmethod
+    def _score(
+            event_interest_ids: AbstractSet[int],
+            closest_date: Optional[datetime],
+            user_interest_ids: set[int],
+            liked_interest_ids: set[int],
+            disliked_interest_ids: set[int],
+            now: datetime,
+    ) -> int:
+        score = len(event_interest_ids & user_interest_ids) * 3
+
+        if closest_date:
+            delta_h = (closest_date - now).total_seconds() / 3600
+            if delta_h < 1:
+                score -= 2
+            elif 1 <= delta_h <= 3:
+                score += 3
+            elif 3 < delta_h <= 24:
+                score += 1
+
+        if event_interest_ids & liked_interest_ids:
+            score += 2
+        if event_interest_ids & disliked_interest_ids:
+            score -= 3
+        return score
+
+    @classmethod
     def _score_events(
+            cls,
             events: List[Event],
             user_interest_ids: set[int],
             liked_interest_ids: set[int],
@@ -109,25 +354,12 @@ class FilterAlgorithm:
         scored = []
 
         for event in events:
-            score = 0
             event_interest_ids = {i.id for i in event.interests}
-            match_count = len(event_interest_ids & user_interest_ids)
-            score += match_count * 3
-
-            closest_date = min((d.date for d in event.date_locations if d.date >= now), default=None)
-            if closest_date:
-                delta_h = (closest_date - now).total_seconds() / 3600
-                if delta_h < 1:
-                    score -= 2
-                elif 1 <= delta_h <= 3:
-                    score += 3
-                elif 3 < delta_h <= 24:
-                    score += 1
-
-            if event_interest_ids & liked_interest_ids:
-                score += 2
-            if event_interest_ids & disliked_interest_ids:
-                score -= 3
-
+            if event.next_occurrence is not None and event.next_occurrence >= now:
+                closest_date = event.next_occurrence
+            else:
+                closest_date = min((d.date for d in event.date_locations if d.date >= now), default=None)
+            score = cls._score(event_interest_ids, closest_date, user_interest_ids,
+                               liked_interest_ids, disliked_interest_ids, now)
             scored.append({"event": event, "score": score})
-        return scored
\ No newline at end of file
+        return scored
@@ -0,0 +1,7 @@
+from .jobs import IngestionJob, IngestionJobRunner, ingestion_runner
+
+__all__ = [
+    "IngestionJob",
+    "IngestionJobRunner",
+    "ingestion_runner",
+]
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, AsyncIterator
+from uuid import UUID, uuid4
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from domain.schemas import IngestionReport
+from domain.services.afisha import EventParser
+from domain.services.recommendations import event_index
+from infra.repositories import EventCRUD
+from infra.db.session import engine, SessionLocal
+
+
+logger = logging.getLogger(__name__)
+
+INGESTION_LOCK_KEY = 7_265_110_301_547_462_401
+
+FINISHED_STAGES = ("succeeded", "failed", "skipped", "cancelled")
+
+
+@dataclass
+class IngestionJob:
+    trigger: str = "manual"
+    id: UUID = field(default_factory=uuid4)
+    stage: str = "queued"
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    report: IngestionReport = field(default_factory=IngestionReport)
+    error: Optional[str] = None
+    parser: Optional[EventParser] = field(default=None, repr=False)
+    _stage_started: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def is_running(self) -> bool:
+        return self.stage not in FINISHED_STAGES
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        finished_at = self.finished_at or datetime.now()
+        return round((finished_at - self.started_at).total_seconds(), 3)
+
+    @property
+    def pages_fetched(self) -> int:
+        return self.parser.http_client.stats.requests if self.parser else 0
+
+    @property
+    def crawl_concurrency(self) -> Optional[int]:
+        return self.parser.current_concurrency if self.parser else None
+
+    def set_stage(self, stage: str) -> None:
+        now = time.monotonic()
+        self.stage_seconds[self.stage] = round(now - self._stage_started, 3)
+        self.stage = stage
+        self._stage_started = now
+
+
+class IngestionJobRunner:
+    def __init__(self, engine: AsyncEngine, session_factory: Callable[[], AsyncSession], *,
+                 crud_factory: Callable[[AsyncSession], EventCRUD] = EventCRUD,
+                 lock_key: int = INGESTION_LOCK_KEY,
+                 history_size: int = 20):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.crud_factory = crud_factory
+        self.lock_key = lock_key
+        self.history_size = history_size
+        self._jobs: "OrderedDict[UUID, IngestionJob]" = OrderedDict()
+        self._current: Optional[IngestionJob] = None
+        self._task: Optional[asyncio.Task] = None
+        self._scheduler: Optional[asyncio.Task] = None
+
+    @property
+    def current(self) -> Optional[IngestionJob]:
+        if self._current is not None and self._current.is_running:
+            return self._current
+        return None
+
+    def get(self, job_id: UUID) -> Optional[IngestionJob]:
+        return self._jobs.get(job_id)
+
+    def recent(self) -> List[IngestionJob]:
+        return list(reversed(self._jobs.values()))
+
+    def start(self, trigger: str = "manual") -> IngestionJob:
+        if self.current is not None:
+            return self.current
+        job = IngestionJob(trigger=trigger)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history_size:
+            self._jobs.popitem(last=False)
+        self._current = job
+        self._task = asyncio.create_task(self._run(job))
+        return job
+
+    async def wait(self) -> None:
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    @asynccontextmanager
+    async def _advisory_lock(self) -> AsyncIterator[bool]:
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key})
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+
+    async def _run(self, job: IngestionJob) -> None:
+        job.started_at = datetime.now()
+        job.set_stage("locking")
+        try:
+            async with self._advisory_lock() as acquired:
+                if not acquired:
+                    job.error = "Another ingestion run is in progress"
+                    job.set_stage("skipped")
+                    return
+                job.set_stage("ingesting")
+                async with self.session_factory() as session:
+                    event_crud = self.crud_factory(session)
+                    job.parser = event_crud.event_parser
+                    await event_crud.add_events_from_parser(report=job.report)
+                    job.set_stage("indexing")
+                    await event_index.load(session)
+                job.set_stage("succeeded")
+        except asyncio.CancelledError:
+            job.set_stage("cancelled")
+            raise
+        except Exception as e:
+            logger.exception(f"Ingestion job {job.id} failed")
+            job.error = f"{type(e).__name__}: {e}"
+            job.set_stage("failed")
+        finally:
+            job.finished_at = datetime.now()
+            logger.info(f"Ingestion job {job.id} {job.stage} in {job.duration_seconds}s: {job.report}")
+
+    def start_scheduler(self, interval_seconds: float) -> None:
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._schedule(interval_seconds))
+
+    async def _schedule(self, interval_seconds: float) -> None:
+        while True:
+            self.start(trigger="schedule")
+            await self.wait()
+            await asyncio.sleep(interval_seconds)
+
+    async def shutdown(self) -> None:
+        for task in (self._scheduler, self._task):
+            if task is not None and not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+
+
+ingestion_runner = IngestionJobRunner(engine, SessionLocal)
@@ -0,0 +1,8 @@
+from .registry import InterestRegistry, InterestCatalogue, InterestEntry, interest_registry
+
+__all__ = [
+    "InterestRegistry",
+    "InterestCatalogue",
+    "InterestEntry",
+    "interest_registry",
+]
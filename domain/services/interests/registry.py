@@ -0,0 +1,109 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, Iterable, Set
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.models import Interest
+
+
+@dataclass(frozen=True)
+class InterestEntry:
+    id: int
+    name: str
+    parent_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class InterestCatalogue:
+    by_id: Dict[int, InterestEntry] = field(default_factory=dict)
+    by_name: Dict[str, int] = field(default_factory=dict)
+    by_lower_name: Dict[str, int] = field(default_factory=dict)
+    children: Dict[int, Tuple[int, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, entries: Iterable[InterestEntry]) -> "InterestCatalogue":
+        by_id, by_name, by_lower_name = {}, {}, {}
+        children: Dict[int, list] = {}
+        for entry in entries:
+            by_id[entry.id] = entry
+            by_name[entry.name] = entry.id
+            by_lower_name.setdefault(entry.name.lower(), entry.id)
+            if entry.parent_id is not None:
+                children.setdefault(entry.parent_id, []).append(entry.id)
+        return cls(
+            by_id=by_id,
+            by_name=by_name,
+            by_lower_name=by_lower_name,
+            children={parent_id: tuple(ids) for parent_id, ids in children.items()},
+        )
+
+    def get_id(self, name: str, *, case_insensitive: bool = False) -> Optional[int]:
+        if case_insensitive:
+            return self.by_lower_name.get(name.lower())
+        return self.by_name.get(name)
+
+    def children_of(self, interest_id: int) -> Tuple[int, ...]:
+        return self.children.get(interest_id, ())
+
+    def descendants_of(self, interest_id: int) -> Set[int]:
+        descendants: Set[int] = set()
+        pending = list(self.children_of(interest_id))
+        while pending:
+            child_id = pending.pop()
+            if child_id not in descendants:
+                descendants.add(child_id)
+                pending.extend(self.children_of(child_id))
+        return descendants
+
+    def with_descendants(self, interest_ids: Iterable[int]) -> Set[int]:
+        ids = set(interest_ids)
+        for interest_id in list(ids):
+            ids.update(self.descendants_of(interest_id))
+        return ids
+
+
+class InterestRegistry:
+    def __init__(self, miss_reload_interval: float = 5.0):
+        self.miss_reload_interval = miss_reload_interval
+        self._catalogue: Optional[InterestCatalogue] = None
+        self._version = 0
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._catalogue is not None
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._catalogue = None
+
+    async def load(self, session: AsyncSession) -> InterestCatalogue:
+        async with self._lock:
+            version = self._version
+            result = await session.execute(select(Interest.id, Interest.name, Interest.parent_id))
+            catalogue = InterestCatalogue.build(
+                InterestEntry(id=row.id, name=row.name, parent_id=row.parent_id) for row in result
+            )
+            if version == self._version:
+                self._catalogue = catalogue
+                self._loaded_at = time.monotonic()
+            return catalogue
+
+    async def get(self, session: AsyncSession) -> InterestCatalogue:
+        catalogue = self._catalogue
+        if catalogue is None:
+            catalogue = await self.load(session)
+        return catalogue
+
+    async def get_id(self, session: AsyncSession, name: str, *, case_insensitive: bool = False) -> Optional[int]:
+        catalogue = await self.get(session)
+        interest_id = catalogue.get_id(name, case_insensitive=case_insensitive)
+        if interest_id is None and time.monotonic() - self._loaded_at > self.miss_reload_interval:
+            catalogue = await self.load(session)
+            interest_id = catalogue.get_id(name, case_insensitive=case_insensitive)
+        return interest_id
+
+
+interest_registry = InterestRegistry()
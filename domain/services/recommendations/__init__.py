@@ -0,0 +1,25 @@
+from .cache import RecommendationCache, CacheStats, recommendation_cache
+from .index import EventIndex, IndexedEvent, event_index
+from .engine import ScoringMatrix, ScoringEngine, scoring_engine
+from .pagination import RankedSnapshot, RecommendationCursor, RankKey
+from .colike import CoLikeModel, CoLikeRebuild, co_like_model
+from .refresher import ModelRefresher
+
+__all__ = [
+    "RecommendationCache",
+    "CacheStats",
+    "recommendation_cache",
+    "EventIndex",
+    "IndexedEvent",
+    "event_index",
+    "ScoringMatrix",
+    "ScoringEngine",
+    "scoring_engine",
+    "RankedSnapshot",
+    "RecommendationCursor",
+    "RankKey",
+    "CoLikeModel",
+    "CoLikeRebuild",
+    "co_like_model",
+    "ModelRefresher",
+]
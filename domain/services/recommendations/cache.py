@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple, TypeVar
+from uuid import UUID
+from infra.config.app_settings import settings
+
+
+T = TypeVar("T")
+CacheKey = Tuple[UUID, Hashable]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    user_invalidations: int = 0
+    global_invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "user_invalidations": self.user_invalidations,
+            "global_invalidations": self.global_invalidations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+
+
+class RecommendationCache:
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._user_keys: Dict[UUID, Set[CacheKey]] = {}
+        self._in_flight: Dict[CacheKey, asyncio.Future] = {}
+        self._user_generations: Dict[UUID, int] = {}
+        self._global_generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _generation(self, user_id: UUID) -> Tuple[int, int]:
+        return self._global_generation, self._user_generations.get(user_id, 0)
+
+    def _lookup(self, key: CacheKey) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        self._entries[key] = _Entry(value=value, expires_at=time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        self._user_keys.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.stats.evictions += 1
+
+    def _drop(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        user_keys = self._user_keys.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[key[0]]
+
+    async def get_or_compute(self, user_id: UUID, params: Hashable,
+                             compute: Callable[[], Awaitable[T]]) -> T:
+        key = (user_id, params)
+        while True:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.stats.hits += 1
+                return entry.value
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            self.stats.coalesced += 1
+            await asyncio.wait([in_flight])
+            if not in_flight.cancelled():
+                return in_flight.result()
+
+        self.stats.misses += 1
+        generation = self._generation(user_id)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await compute()
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if generation == self._generation(user_id):
+            self._store(key, value)
+        return value
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        self._user_generations[user_id] = self._user_generations.get(user_id, 0) + 1
+        for key in list(self._user_keys.get(user_id, ())):
+            self._drop(key)
+        self._in_flight = {key: task for key, task in self._in_flight.items() if key[0] != user_id}
+        self.stats.user_invalidations += 1
+
+    def invalidate_all(self) -> None:
+        self._global_generation += 1
+        self._entries.clear()
+        self._user_keys.clear()
+        self._in_flight.clear()
+        self.stats.global_invalidations += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "in_flight": len(self._in_flight),
+            **self.stats.as_dict(),
+        }
+
+
+recommendation_cache = RecommendationCache(
+    ttl=settings.RECOMMENDATION_CACHE_TTL,
+    max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+import numpy as np
+from sqlalchemy import select, delete, func, literal, union_all, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.models import UserEventFeedback, EventCoLike, UserLikeSnapshot
+
+
+CO_LIKE_LOCK_KEY = 7_265_110_301_547_462_402
+
+
+@dataclass
+class CoLikeRebuild:
+    likes_added: int = 0
+    likes_removed: int = 0
+    pairs_updated: int = 0
+    pairs_deleted: int = 0
+    seconds: float = 0.0
+
+
+class CoLikeModel:
+    def __init__(self, max_age: float = 300.0):
+        self.max_age = max_age
+        self.event_ids: List[UUID] = []
+        self.row_of: Dict[UUID, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.likes = np.zeros(0, dtype=np.int32)
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.likes)
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age
+
+    async def load(self, session: AsyncSession) -> "CoLikeModel":
+        async with self._lock:
+            await self._load(session)
+        return self
+
+    async def get(self, session: AsyncSession) -> "CoLikeModel":
+        if self.is_stale:
+            async with self._lock:
+                if self.is_stale:
+                    await self._load(session)
+        return self
+
+    async def _load(self, session: AsyncSession) -> None:
+        stmt = select(EventCoLike.event_id, EventCoLike.other_event_id, EventCoLike.likes)
+        row_of: Dict[UUID, int] = {}
+        rows, indices, likes = [], [], []
+        for event_id, other_event_id, count in await session.execute(stmt):
+            rows.append(row_of.setdefault(event_id, len(row_of)))
+            indices.append(row_of.setdefault(other_event_id, len(row_of)))
+            likes.append(count)
+        event_ids = list(row_of)
+        rows = np.asarray(rows, dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(len(event_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(event_ids)), out=indptr[1:])
+        self.event_ids = event_ids
+        self.row_of = row_of
+        self.indptr = indptr
+        self.indices = np.asarray(indices, dtype=np.int32)[order]
+        self.likes = np.asarray(likes, dtype=np.int32)[order]
+        self._loaded_at = time.monotonic()
+
+    def scores(self, liked_event_ids: Iterable[UUID], weight: int, cap: int) -> Dict[UUID, int]:
+        rows = [self.row_of[event_id] for event_id in liked_event_ids if event_id in self.row_of]
+        if not rows or weight <= 0:
+            return {}
+        slices = [slice(self.indptr[row], self.indptr[row + 1]) for row in rows]
+        indices = np.concatenate([self.indices[s] for s in slices])
+        likes = np.concatenate([self.likes[s] for s in slices])
+        totals = np.bincount(indices, weights=likes, minlength=len(self.event_ids))
+        nonzero = np.flatnonzero(totals)
+        terms = np.minimum(totals[nonzero], cap).astype(np.int64) * weight
+        return {self.event_ids[i]: int(term) for i, term in zip(nonzero, terms)}
+
+    @staticmethod
+    async def rebuild(session: AsyncSession, full: bool = False) -> CoLikeRebuild:
+        started = time.perf_counter()
+        result = CoLikeRebuild()
+        async with session.bind.connect() as lock_conn:
+            lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+            await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": CO_LIKE_LOCK_KEY})
+            try:
+                await CoLikeModel._apply_changes(session, full, result)
+            finally:
+                await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": CO_LIKE_LOCK_KEY})
+        result.seconds = round(time.perf_counter() - started, 3)
+        return result
+
+    @staticmethod
+    async def _apply_changes(session: AsyncSession, full: bool, result: CoLikeRebuild) -> None:
+        async with session.begin():
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            if full:
+                await session.execute(delete(EventCoLike))
+                await session.execute(delete(UserLikeSnapshot))
+
+            snapshot = UserLikeSnapshot.__table__
+            co_likes = EventCoLike.__table__
+            likes = (
+                select(UserEventFeedback.user_id, UserEventFeedback.event_id)
+                .where(UserEventFeedback.like.is_(True))
+                .distinct()
+            )
+            known = select(snapshot.c.user_id, snapshot.c.event_id)
+            added = likes.except_(known).cte("added")
+            removed = known.except_(likes).cte("removed")
+            kept = known.intersect(likes).cte("kept")
+            changes = union_all(
+                select(added.c.user_id, added.c.event_id, literal(1).label("sign")),
+                select(removed.c.user_id, removed.c.event_id, literal(-1).label("sign")),
+            ).cte("changes")
+            other = changes.alias("other")
+            pairs = union_all(
+                select(changes.c.event_id.label("event_id"), kept.c.event_id.label("other_event_id"), changes.c.sign)
+                .join(kept, kept.c.user_id == changes.c.user_id),
+                select(kept.c.event_id, changes.c.event_id, changes.c.sign)
+                .join(kept, kept.c.user_id == changes.c.user_id),
+                select(changes.c.event_id, other.c.event_id, changes.c.sign)
+                .join(other, (other.c.user_id == changes.c.user_id) & (other.c.sign == changes.c.sign))
+                .where(other.c.event_id != changes.c.event_id),
+            ).cte("pairs")
+            delta = (
+                select(pairs.c.event_id, pairs.c.other_event_id, func.sum(pairs.c.sign).label("likes"))
+                .group_by(pairs.c.event_id, pairs.c.other_event_id)
+                .having(func.sum(pairs.c.sign) != 0)
+            )
+            upsert = pg_insert(co_likes).from_select(["event_id", "other_event_id", "likes"], delta)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=[co_likes.c.event_id, co_likes.c.other_event_id],
+                set_={"likes": co_likes.c.likes + upsert.excluded.likes},
+            )
+            result.pairs_updated = (await session.execute(upsert)).rowcount
+            result.pairs_deleted = (await session.execute(delete(co_likes).where(co_likes.c.likes <= 0))).rowcount
+
+            result.likes_added = (await session.execute(
+                snapshot.insert().from_select(["user_id", "event_id"], likes.except_(known))
+            )).rowcount
+            result.likes_removed = (await session.execute(
+                delete(snapshot).where(
+                    snapshot.c.user_id == removed.c.user_id,
+                    snapshot.c.event_id == removed.c.event_id,
+                )
+            )).rowcount
+
+
+co_like_model = CoLikeModel()
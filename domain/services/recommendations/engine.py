@@ -0,0 +1,170 @@
+import asyncio
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from .cache import recommendation_cache
+from .index import EventIndex, IndexedEvent, event_index
+
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+HOUR = 3600 * 10 ** 6
+
+
+def to_micros(value: datetime) -> int:
+    return (value - EPOCH) // MICROSECOND
+
+
+@dataclass(frozen=True)
+class ScoringMatrix:
+    event_ids: List[UUID]
+    row_of: Dict[UUID, int]
+    column_of: Dict[int, int]
+    column_indptr: np.ndarray
+    column_rows: np.ndarray
+    date_indptr: np.ndarray
+    dates: np.ndarray
+    first_dates: np.ndarray
+    last_dates: np.ndarray
+
+    @classmethod
+    def build(cls, events: Iterable[IndexedEvent]) -> "ScoringMatrix":
+        events = sorted((event for event in events if event.interest_ids and event.dates), key=lambda e: e.id)
+        column_of: Dict[int, int] = {}
+        interest_rows: List[int] = []
+        interest_columns: List[int] = []
+        dates: List[int] = []
+        date_indptr = [0]
+        for row, event in enumerate(events):
+            for interest_id in event.interest_ids:
+                interest_rows.append(row)
+                interest_columns.append(column_of.setdefault(interest_id, len(column_of)))
+            dates.extend(to_micros(date) for date in event.dates)
+            date_indptr.append(len(dates))
+
+        rows = np.asarray(interest_rows, dtype=np.int32)
+        columns = np.asarray(interest_columns, dtype=np.int32)
+        order = np.argsort(columns, kind="stable")
+        column_indptr = np.zeros(len(column_of) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(column_of)), out=column_indptr[1:])
+
+        date_indptr = np.asarray(date_indptr, dtype=np.int64)
+        dates = np.asarray(dates, dtype=np.int64)
+        event_ids = [event.id for event in events]
+        return cls(
+            event_ids=event_ids,
+            row_of={event_id: row for row, event_id in enumerate(event_ids)},
+            column_of=column_of,
+            column_indptr=column_indptr,
+            column_rows=rows[order],
+            date_indptr=date_indptr,
+            dates=dates,
+            first_dates=dates[date_indptr[:-1]] if len(event_ids) else dates,
+            last_dates=dates[date_indptr[1:] - 1] if len(event_ids) else dates,
+        )
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    def interest_counts(self, interest_ids: AbstractSet[int]) -> np.ndarray:
+        columns = [self.column_of[i] for i in interest_ids if i in self.column_of]
+        if not columns:
+            return np.zeros(len(self), dtype=np.int64)
+        rows = np.concatenate([
+            self.column_rows[self.column_indptr[column]:self.column_indptr[column + 1]] for column in columns
+        ])
+        return np.bincount(rows, minlength=len(self))
+
+    def next_dates(self, rows: np.ndarray, now: datetime) -> np.ndarray:
+        past = np.concatenate(([0], np.cumsum(self.dates < to_micros(now))))
+        starts, ends = self.date_indptr[rows], self.date_indptr[rows + 1]
+        positions = starts + past[ends] - past[starts]
+        return self.dates[np.minimum(positions, ends - 1)]
+
+    def top_k(self,
+              limit: int,
+              now: datetime,
+              date_limit: datetime,
+              user_interest_ids: AbstractSet[int],
+              liked_interest_ids: AbstractSet[int],
+              disliked_interest_ids: AbstractSet[int],
+              exclude_ids: AbstractSet[UUID] = frozenset(),
+              boosts: Optional[Mapping[UUID, int]] = None,
+              after: Optional[Tuple[int, UUID]] = None) -> List[Tuple[UUID, int]]:
+        if not len(self) or limit <= 0:
+            return []
+        now_micros = to_micros(now)
+        match_count = self.interest_counts(user_interest_ids)
+        candidates = (match_count > 0) & (self.last_dates >= now_micros) & (self.first_dates <= to_micros(date_limit))
+        excluded = [self.row_of[event_id] for event_id in exclude_ids if event_id in self.row_of]
+        candidates[excluded] = False
+        rows = np.flatnonzero(candidates)
+        if not len(rows):
+            return []
+
+        delta = self.next_dates(rows, now) - now_micros
+        date_score = np.select(
+            [delta < HOUR, delta <= 3 * HOUR, delta <= 24 * HOUR],
+            [-2, 3, 1],
+            default=0,
+        )
+        liked = self.interest_counts(liked_interest_ids)[rows] > 0
+        disliked = self.interest_counts(disliked_interest_ids)[rows] > 0
+        scores = match_count[rows] * 3 + date_score + liked * 2 - disliked * 3
+        if boosts:
+            boost = np.zeros(len(self), dtype=np.int64)
+            for event_id, value in boosts.items():
+                if event_id in self.row_of:
+                    boost[self.row_of[event_id]] = value
+            scores = scores + boost[rows]
+        if after is not None:
+            after_score, after_id = after
+            first_row = bisect_right(self.event_ids, after_id)
+            keep = (scores < after_score) | ((scores == after_score) & (rows >= first_row))
+            rows, scores = rows[keep], scores[keep]
+
+        order_key = -scores.astype(np.int64) * len(self) + rows
+        if limit < len(rows):
+            top = np.argpartition(order_key, limit - 1)[:limit]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(order_key[top])]
+        return [(self.event_ids[rows[i]], int(scores[i])) for i in top]
+
+
+class ScoringEngine:
+    def __init__(self, index: EventIndex):
+        self.index = index
+        self._matrix: Optional[ScoringMatrix] = None
+        self._version: Optional[int] = None
+        self._build: Optional[asyncio.Task] = None
+        index.subscribe(lambda _: self.schedule())
+
+    @property
+    def is_current(self) -> bool:
+        return self._version == self.index.version
+
+    def schedule(self) -> asyncio.Task:
+        if self._build is None or self._build.done():
+            self._build = asyncio.create_task(self._rebuild())
+        return self._build
+
+    async def matrix(self) -> ScoringMatrix:
+        if not self.is_current:
+            build = self.schedule()
+            if self._matrix is None:
+                await asyncio.shield(build)
+        return self._matrix
+
+    async def _rebuild(self) -> None:
+        while not self.is_current:
+            version = self.index.version
+            matrix = await asyncio.to_thread(ScoringMatrix.build, self.index.events())
+            self._matrix, self._version = matrix, version
+            recommendation_cache.invalidate_all()
+
+
+scoring_engine = ScoringEngine(event_index)
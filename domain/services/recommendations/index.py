@@ -0,0 +1,188 @@
+import asyncio
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.models import Event, EventDateLocation
+from domain.models.event import event_interest_association
+
+
+def hour_key(value: datetime) -> int:
+    return value.toordinal() * 24 + value.hour
+
+
+@dataclass(frozen=True)
+class IndexedEvent:
+    id: UUID
+    interest_ids: FrozenSet[int]
+    dates: Tuple[datetime, ...]
+
+    @property
+    def first_date(self) -> datetime:
+        return self.dates[0]
+
+    @property
+    def last_date(self) -> datetime:
+        return self.dates[-1]
+
+    def next_date(self, now: datetime) -> Optional[datetime]:
+        position = bisect_left(self.dates, now)
+        return self.dates[position] if position < len(self.dates) else None
+
+    def is_candidate(self, now: datetime, date_limit: datetime) -> bool:
+        return self.last_date >= now and self.first_date <= date_limit
+
+
+class EventIndex:
+    def __init__(self, max_age: float = 300.0):
+        self.max_age = max_age
+        self._events: Dict[UUID, IndexedEvent] = {}
+        self._postings: Dict[int, Dict[int, Set[UUID]]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._listeners: List[Callable[["EventIndex"], None]] = []
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age
+
+    def get_event(self, event_id: UUID) -> Optional[IndexedEvent]:
+        return self._events.get(event_id)
+
+    def events(self) -> List[IndexedEvent]:
+        return list(self._events.values())
+
+    def subscribe(self, listener: Callable[["EventIndex"], None]) -> None:
+        self._listeners.append(listener)
+
+    def _changed(self) -> None:
+        for listener in self._listeners:
+            listener(self)
+
+    async def load(self, session: AsyncSession) -> "EventIndex":
+        async with self._lock:
+            await self._load(session)
+        return self
+
+    async def get(self, session: AsyncSession) -> "EventIndex":
+        if self.is_stale:
+            async with self._lock:
+                if self.is_stale:
+                    await self._load(session)
+        return self
+
+    async def _load(self, session: AsyncSession) -> None:
+        self.replace(await self._fetch(session))
+
+    def replace(self, events: Iterable[IndexedEvent]) -> None:
+        self._events = {}
+        self._postings = {}
+        for event in events:
+            self._add(event)
+        self._loaded_at = time.monotonic()
+        self.version += 1
+        self._changed()
+
+    async def refresh(self, session: AsyncSession, event_ids: Iterable[UUID]) -> None:
+        if not self.is_loaded:
+            return
+        event_ids = list(event_ids)
+        async with self._lock:
+            events = await self._fetch(session, event_ids)
+            for event_id in event_ids:
+                self._remove(event_id)
+            for event in events:
+                self._add(event)
+        self._changed()
+
+    def prune(self, now: datetime) -> None:
+        version = self.version
+        for event in list(self._events.values()):
+            if event.first_date >= now:
+                continue
+            self._remove(event.id)
+            dates = tuple(date for date in event.dates if date >= now)
+            if dates:
+                self._add(IndexedEvent(id=event.id, interest_ids=event.interest_ids, dates=dates))
+        if self.version != version:
+            self._changed()
+
+    def candidates(self, interest_ids: Iterable[int], now: datetime, date_limit: datetime) -> Set[UUID]:
+        limit_key = hour_key(date_limit)
+        event_ids: Set[UUID] = set()
+        for interest_id in interest_ids:
+            for key, bucket in self._postings.get(interest_id, {}).items():
+                if key <= limit_key:
+                    event_ids |= bucket
+        return {event_id for event_id in event_ids if self._events[event_id].is_candidate(now, date_limit)}
+
+    def _add(self, event: IndexedEvent) -> None:
+        self.version += 1
+        self._events[event.id] = event
+        key = hour_key(event.first_date)
+        for interest_id in event.interest_ids:
+            self._postings.setdefault(interest_id, {}).setdefault(key, set()).add(event.id)
+
+    def _remove(self, event_id: UUID) -> None:
+        event = self._events.pop(event_id, None)
+        if event is None:
+            return
+        self.version += 1
+        key = hour_key(event.first_date)
+        for interest_id in event.interest_ids:
+            buckets = self._postings.get(interest_id)
+            bucket = buckets.get(key) if buckets else None
+            if bucket is None:
+                continue
+            bucket.discard(event_id)
+            if not bucket:
+                del buckets[key]
+            if not buckets:
+                del self._postings[interest_id]
+
+    @staticmethod
+    async def _fetch(session: AsyncSession, event_ids: Optional[List[UUID]] = None) -> List[IndexedEvent]:
+        now = datetime.now()
+        eia = event_interest_association
+        dates_stmt = (
+            select(EventDateLocation.event_id, EventDateLocation.date)
+            .join(Event, Event.id == EventDateLocation.event_id)
+            .where(Event.is_active.is_(True), Event.last_occurrence >= now)
+        )
+        interests_stmt = (
+            select(eia.c.event_id, eia.c.interest_id)
+            .join(Event, Event.id == eia.c.event_id)
+            .where(Event.is_active.is_(True), Event.last_occurrence >= now)
+        )
+        if event_ids is not None:
+            dates_stmt = dates_stmt.where(EventDateLocation.event_id.in_(event_ids))
+            interests_stmt = interests_stmt.where(eia.c.event_id.in_(event_ids))
+
+        dates: Dict[UUID, List[datetime]] = defaultdict(list)
+        for event_id, date in await session.execute(dates_stmt):
+            dates[event_id].append(date)
+        interests: Dict[UUID, Set[int]] = defaultdict(set)
+        for event_id, interest_id in await session.execute(interests_stmt):
+            interests[event_id].add(interest_id)
+
+        return [
+            IndexedEvent(id=event_id, interest_ids=frozenset(interests[event_id]), dates=tuple(sorted(event_dates)))
+            for event_id, event_dates in dates.items()
+            if event_id in interests and max(event_dates) >= now
+        ]
+
+
+event_index = EventIndex()
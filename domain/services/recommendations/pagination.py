@@ -0,0 +1,82 @@
+import base64
+import json
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
+
+
+RankKey = Tuple[int, UUID]
+
+
+@dataclass(frozen=True)
+class RankedSnapshot:
+    ranked: Tuple[Tuple[UUID, int], ...]
+    after: Optional[RankKey] = None
+    complete: bool = True
+    id: UUID = field(default_factory=uuid4)
+
+    def position_after(self, cursor: "RecommendationCursor") -> int:
+        if cursor.snapshot_id == self.id:
+            if not 0 <= cursor.offset <= len(self.ranked):
+                raise ValueError("Cursor offset is out of range")
+            return cursor.offset
+        keys = [(-score, event_id) for event_id, score in self.ranked]
+        return bisect_right(keys, (-cursor.score, cursor.event_id))
+
+    def page(self, limit: int, cursor: Optional["RecommendationCursor"] = None
+             ) -> Tuple[List[Tuple[UUID, int]], Optional["RecommendationCursor"]]:
+        start = self.position_after(cursor) if cursor is not None else 0
+        items = list(self.ranked[start:start + limit])
+        end = start + len(items)
+        if end < len(self.ranked):
+            event_id, score = items[-1]
+            return items, RecommendationCursor(self.id, end, score, event_id, self.after)
+        if self.complete or not self.ranked:
+            return items, None
+        event_id, score = self.ranked[-1]
+        return items, RecommendationCursor(None, 0, score, event_id, (score, event_id))
+
+
+@dataclass(frozen=True)
+class RecommendationCursor:
+    snapshot_id: Optional[UUID]
+    offset: int
+    score: int
+    event_id: UUID
+    after: Optional[RankKey] = None
+
+    def encode(self) -> str:
+        payload = json.dumps([
+            str(self.snapshot_id) if self.snapshot_id else None, self.offset, self.score, str(self.event_id),
+            [self.after[0], str(self.after[1])] if self.after else None,
+        ])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "RecommendationCursor":
+        padded = value + "=" * (-len(value) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != 5:
+            raise ValueError("Malformed cursor")
+        snapshot_id, offset, score, event_id, after = payload
+        if after is not None and not (isinstance(after, list) and len(after) == 2):
+            raise ValueError("Malformed cursor")
+        if _int(offset) < 0:
+            raise ValueError("Cursor offset is negative")
+        return cls(
+            _uuid(snapshot_id) if snapshot_id is not None else None, offset, _int(score), _uuid(event_id),
+            (_int(after[0]), _uuid(after[1])) if after is not None else None,
+        )
+
+
+def _int(value: object) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or not -2 ** 31 <= value < 2 ** 31:
+        raise ValueError("Cursor field is not a 32-bit integer")
+    return value
+
+
+def _uuid(value: object) -> UUID:
+    if not isinstance(value, str):
+        raise ValueError("Cursor id is not a string")
+    return UUID(value)
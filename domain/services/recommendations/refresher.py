@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from infra.config.app_settings import settings
+from .index import event_index
+from .colike import co_like_model
+
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRefresher:
+    def __init__(self, session_factory: Callable[[], AsyncSession], interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        async with self.session_factory() as session:
+            await event_index.load(session)
+            if settings.RECOMMENDATION_COLIKE_WEIGHT > 0:
+                await co_like_model.load(session)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Recommendation model refresh failed")
+
+    async def shutdown(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
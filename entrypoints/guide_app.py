@@ -1,9 +1,29 @@
 from api import users_router, auth_router, events_router
+from domain.services.interests import interest_registry
+from domain.services.ingestion import ingestion_runner
+from domain.services.recommendations import event_index, ModelRefresher
+from infra.config.app_settings import settings
+from infra.db.session import SessionLocal
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 
-app = FastAPI(title="MyGuide API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with SessionLocal() as session:
+        await interest_registry.load(session)
+        await event_index.load(session)
+    refresher = ModelRefresher(SessionLocal, settings.RECOMMENDATION_REFRESH_INTERVAL)
+    refresher.start()
+    if settings.INGESTION_INTERVAL_MINUTES:
+        ingestion_runner.start_scheduler(settings.INGESTION_INTERVAL_MINUTES * 60)
+    yield
+    await ingestion_runner.shutdown()
+    await refresher.shutdown()
+
+
+app = FastAPI(title="MyGuide API", lifespan=lifespan)
 
 app.include_router(users_router)
 app.include_router(auth_router)
-app.include_router(events_router)
\ No newline at end of file
+app.include_router(events_router)
@@ -0,0 +1,22 @@
+import argparse
+import asyncio
+
+from domain.services.recommendations import CoLikeModel
+from infra.db.session import SessionLocal, engine
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with SessionLocal() as session:
+        result = await CoLikeModel.rebuild(session, full=args.full)
+    await engine.dispose()
+    print(result)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Update the event co-like model from user feedback")
+    arg_parser.add_argument("--full", action="store_true", help="rebuild from scratch instead of applying the like diff")
+    asyncio.run(run(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
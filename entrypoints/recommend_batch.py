@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import json
+import sys
+from uuid import UUID
+
+from domain.services.algorithms import BatchRecommender
+from infra.db.session import SessionLocal, engine
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with SessionLocal() as session:
+        recommender = BatchRecommender(session, limit=args.limit, chunk_size=args.chunk_size, workers=args.workers)
+        result = await recommender.recommend(args.user or None)
+    await engine.dispose()
+
+    for user_id, scored_ids in result.recommendations.items():
+        print(json.dumps({
+            "user_id": str(user_id),
+            "events": [{"id": str(event_id), "score": score} for event_id, score in scored_ids],
+        }))
+    print(f"{result.users} users in {result.seconds}s ({result.users_per_second} users/s)", file=sys.stderr)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Compute top-N recommendations for many users at once")
+    arg_parser.add_argument("--user", type=UUID, action="append", help="user id, may be repeated; default is all users")
+    arg_parser.add_argument("--limit", type=int, default=10)
+    arg_parser.add_argument("--chunk-size", type=int, default=500)
+    arg_parser.add_argument("--workers", type=int, default=None)
+    asyncio.run(run(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
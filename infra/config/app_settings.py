@@ -12,6 +12,15 @@ class Settings(BaseSettings):
     POSTGRES_HOST: Optional[str] = None
     JWT_PRIVATE_KEY_PATH: Optional[str] = None
     JWT_PUBLIC_KEY_PATH: Optional[str] = None
+    AFISHA_PAGE_CACHE_PATH: Optional[str] = None
+    AFISHA_PARSE_WORKERS: Optional[int] = None
+    INGESTION_INTERVAL_MINUTES: Optional[float] = None
+    RECOMMENDATION_CACHE_TTL: float = 60.0
+    RECOMMENDATION_CACHE_MAX_ENTRIES: int = 10_000
+    RECOMMENDATION_SNAPSHOT_SIZE: int = 200
+    RECOMMENDATION_REFRESH_INTERVAL: float = 240.0
+    RECOMMENDATION_COLIKE_WEIGHT: int = 0
+    RECOMMENDATION_COLIKE_CAP: int = 3
 
     @property
     def database_url(self) -> str:
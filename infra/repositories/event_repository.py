@@ -1,31 +1,59 @@
-from typing import List, Optional
-from domain.schemas import EventCreate, EventRead
+from typing import List, Optional, Dict, Tuple, Iterable, AsyncIterator
+from domain.schemas import EventCreate, EventRead, EventPage, EventSearchHit, EventSearchPage, IngestionReport, PruneResult
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from domain.models import Interest, Event, EventDateLocation
-from sqlalchemy import select, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from domain.models import Interest, Event, EventDateLocation, CrawlState, UserEventFeedback
+from domain.models.event import event_interest_association
+from domain.models.interest_closure import closure_insert_statements
+from sqlalchemy import select, update, delete, exists, func, and_, or_, literal_column, Select, Update
 from domain import exeptions
 from datetime import datetime
-from domain.services.afisha import EventParser
+from collections import defaultdict
+from uuid import UUID, uuid4
+from domain.services.afisha import EventParser, PageCache, get_sources
+from domain.services.interests import interest_registry
+from domain.services.recommendations import recommendation_cache, event_index
+from infra.config.app_settings import settings
+import base64
 import hashlib
+import json
+import math
+
+
+SEARCH_CONFIG = literal_column("'russian'::regconfig")
 
 
 class EventCRUD:
     def __init__(self, session: AsyncSession, event_parser: Optional[EventParser] = None):
         self.session = session
-        self.event_parser = event_parser or EventParser()
+        self.event_parser = event_parser or EventParser(
+            page_cache=self._default_page_cache(),
+            parse_workers=settings.AFISHA_PARSE_WORKERS,
+            sources=get_sources(),
+        )
+        self._created_interests: Dict[str, Interest] = {}
+        self._interests_changed = False
+
+    @staticmethod
+    def _default_page_cache() -> Optional[PageCache]:
+        if settings.AFISHA_PAGE_CACHE_PATH is None:
+            return None
+        return PageCache(settings.AFISHA_PAGE_CACHE_PATH)
 
     async def event_create(self, event: EventCreate) -> EventRead:
         interests = await self._get_interests_by_names(event.interests)
         new_event = Event(
             title=event.title,
             description=event.description,
+            description_hash=self.get_description_hash(event.description or ""),
             interests=interests,
         )
-        for dl in event.date_locations:
+        for date, location in dict.fromkeys((dl.date, dl.location) for dl in event.date_locations):
             new_event.date_locations.append(
-                EventDateLocation(date=dl.date, location=dl.location)
+                EventDateLocation(date=date, location=location)
             )
+        new_event.refresh_occurrences()
         self.session.add(new_event)
 
         try:
@@ -34,49 +62,476 @@ class EventCRUD:
         except Exception:
             await self.session.rollback()
             raise exeptions.InternalServerErrorException("Something went wrong")
+        recommendation_cache.invalidate_all()
+        await event_index.refresh(self.session, [new_event.id])
 
         return EventRead.model_validate(new_event)
 
-    async def delete_invalid_events(self) -> List[EventRead]:
+    async def delete_invalid_events(self, include_deleted: bool = False, chunk_size: int = 1000) -> PruneResult:
         now = datetime.now()
-        deleted_events = []
+        result = PruneResult(deleted_events=[] if include_deleted else None)
+
+        while True:
+            async with self.session.begin():
+                past_ids = (
+                    select(EventDateLocation.id)
+                    .where(EventDateLocation.date < now)
+                    .limit(chunk_size)
+                    .scalar_subquery()
+                )
+                deleted = (await self.session.execute(
+                    delete(EventDateLocation)
+                    .where(EventDateLocation.id.in_(past_ids))
+                    .returning(EventDateLocation.event_id)
+                    .execution_options(synchronize_session=False)
+                )).scalars().all()
+                if deleted:
+                    await self.session.execute(self._refresh_occurrences_stmt(set(deleted)))
+            result.date_locations_deleted += len(deleted)
+            if len(deleted) < chunk_size:
+                break
+
         async with self.session.begin():
-            stmt = select(Event).options(selectinload(Event.date_locations), selectinload(Event.feedback))
-            result = await self.session.execute(stmt)
-            events = result.scalars().all()
+            deactivated = await self.session.execute(
+                update(Event)
+                .where(Event.is_active.is_(True), or_(Event.last_occurrence.is_(None), Event.last_occurrence < now))
+                .values(is_active=False)
+                .execution_options(synchronize_session=False)
+            )
+            reactivated = await self.session.execute(
+                update(Event)
+                .where(Event.is_active.is_(False), Event.last_occurrence >= now)
+                .values(is_active=True)
+                .execution_options(synchronize_session=False)
+            )
+        result.events_deactivated = deactivated.rowcount
+        result.events_reactivated = reactivated.rowcount
+
+        has_feedback = exists().where(UserEventFeedback.event_id == Event.id)
+        while True:
+            async with self.session.begin():
+                stmt = (
+                    select(Event.id)
+                    .where(Event.is_active.is_(False), ~has_feedback)
+                    .limit(chunk_size)
+                    .with_for_update(skip_locked=True)
+                )
+                event_ids = list((await self.session.scalars(stmt)).all())
+                if not event_ids:
+                    break
+                if include_deleted:
+                    events = await self.session.scalars(select(Event).where(Event.id.in_(event_ids)))
+                    result.deleted_events.extend(EventRead.model_validate(event) for event in events)
+                await self.session.execute(
+                    delete(event_interest_association)
+                    .where(event_interest_association.c.event_id.in_(event_ids))
+                )
+                await self.session.execute(
+                    delete(EventDateLocation)
+                    .where(EventDateLocation.event_id.in_(event_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                await self.session.execute(
+                    delete(Event)
+                    .where(Event.id.in_(event_ids))
+                    .execution_options(synchronize_session=False)
+                )
+            result.events_deleted += len(event_ids)
+            if include_deleted:
+                self.session.expunge_all()
+            if len(event_ids) < chunk_size:
+                break
+        if result.date_locations_deleted or result.events_deactivated or result.events_reactivated \
+                or result.events_deleted:
+            recommendation_cache.invalidate_all()
+        event_index.prune(now)
+        return result
+
+    @staticmethod
+    def _events_filter(stmt: Select,
+                       interest_ids: Optional[List[int]] = None,
+                       date_from: Optional[datetime] = None,
+                       date_to: Optional[datetime] = None) -> Select:
+        if interest_ids:
+            stmt = stmt.where(exists().where(
+                event_interest_association.c.event_id == Event.id,
+                event_interest_association.c.interest_id.in_(interest_ids),
+            ))
+        if date_from is not None or date_to is not None:
+            date_filter = [EventDateLocation.event_id == Event.id]
+            if date_from is not None:
+                date_filter.append(EventDateLocation.date >= date_from)
+            if date_to is not None:
+                date_filter.append(EventDateLocation.date <= date_to)
+            stmt = stmt.where(exists().where(*date_filter))
+        return stmt
+
+    @classmethod
+    def _events_listing_stmt(cls, after: Optional[UUID] = None,
+                             interest_ids: Optional[List[int]] = None,
+                             date_from: Optional[datetime] = None,
+                             date_to: Optional[datetime] = None) -> Select:
+        stmt = (
+            select(Event)
+            .options(selectinload(Event.date_locations), selectinload(Event.interests))
+            .order_by(Event.id)
+        )
+        if after is not None:
+            stmt = stmt.where(Event.id > after)
+        return cls._events_filter(stmt, interest_ids, date_from, date_to)
+
+    async def get_events_page(self, limit: int = 50, after: Optional[UUID] = None,
+                              interest_ids: Optional[List[int]] = None,
+                              date_from: Optional[datetime] = None,
+                              date_to: Optional[datetime] = None) -> EventPage:
+        stmt = self._events_listing_stmt(after, interest_ids, date_from, date_to).limit(limit + 1)
+        events = list((await self.session.scalars(stmt)).all())
+        next_cursor = events[limit - 1].id if len(events) > limit else None
+        return EventPage(
+            items=list(EventRead.model_validate(event) for event in events[:limit]),
+            next_cursor=next_cursor,
+        )
+
+    async def stream_events(self, after: Optional[UUID] = None,
+                            interest_ids: Optional[List[int]] = None,
+                            date_from: Optional[datetime] = None,
+                            date_to: Optional[datetime] = None,
+                            chunk_size: int = 500) -> AsyncIterator[EventRead]:
+        stmt = self._events_listing_stmt(after, interest_ids, date_from, date_to)
+        result = await self.session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for events in result.scalars().partitions():
             for event in events:
+                yield EventRead.model_validate(event)
+            self.session.expunge_all()
 
-                event.date_locations[:] = [dl for dl in event.date_locations if dl.date >= now]
-                event.is_active = bool(event.date_locations)
-                if not event.is_active and not event.feedback:
-                    deleted_events.append(event)
-                    await self.session.delete(event)
-        return list(EventRead.model_validate(deleted_event) for deleted_event in deleted_events)
+    async def search_events(self, query: str, limit: int = 20, cursor: Optional[str] = None,
+                            interest_ids: Optional[List[int]] = None,
+                            date_from: Optional[datetime] = None,
+                            date_to: Optional[datetime] = None) -> EventSearchPage:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(Event.search_vector, ts_query)
+        stmt = (
+            select(Event, rank.label("rank"))
+            .where(Event.search_vector.bool_op("@@")(ts_query))
+            .options(selectinload(Event.date_locations), selectinload(Event.interests))
+            .order_by(rank.desc(), Event.id)
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            after_rank, after_id = self._decode_search_cursor(cursor)
+            stmt = stmt.where(or_(rank < after_rank, and_(rank == after_rank, Event.id > after_id)))
+        stmt = self._events_filter(stmt, interest_ids, date_from, date_to)
 
-    async def get_all_events(self) -> List[EventRead]:
-        stmt = select(Event).options(selectinload(Event.date_locations), selectinload(Event.interests))
-        result = await self.session.execute(stmt)
-        events = result.scalars().all()
+        rows = (await self.session.execute(stmt)).all()
+        items = [EventSearchHit(**dict(EventRead.model_validate(event)), rank=rank) for event, rank in rows[:limit]]
+        next_cursor = self._encode_search_cursor(rows[limit - 1].rank, rows[limit - 1].Event.id) \
+            if len(rows) > limit else None
+        return EventSearchPage(items=items, next_cursor=next_cursor)
 
-        return list(EventRead.model_validate(event) for event in events)
+    @staticmethod
+    def _encode_search_cursor(rank: float, event_id: UUID) -> str:
+        payload = json.dumps([rank, str(event_id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
 
-    async def add_events_from_parser(self) -> None:
-        new_events = await self.event_parser.parse()
+    @staticmethod
+    def _decode_search_cursor(cursor: str) -> Tuple[float, UUID]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if not isinstance(payload, list) or len(payload) != 2:
+                raise ValueError("Malformed cursor")
+            rank, event_id = payload
+            if isinstance(rank, bool) or not isinstance(rank, (int, float)) or not math.isfinite(rank):
+                raise ValueError("Cursor rank is not a number")
+            if not isinstance(event_id, str):
+                raise ValueError("Cursor id is not a string")
+            return float(rank), UUID(event_id)
+        except (ValueError, TypeError):
+            raise exeptions.BadRequestException("Invalid cursor")
 
+    async def add_events_from_parser(self, batch_size: int = 100,
+                                     report: Optional[IngestionReport] = None,
+                                     bulk: bool = True) -> IngestionReport:
+        report = report or IngestionReport()
+        batch = []
+        async for event_data in self.event_parser.stream():
+            batch.append(event_data)
+            if len(batch) >= batch_size:
+                await self._write_batch(batch, report, bulk)
+                batch = []
+        if batch:
+            await self._write_batch(batch, report, bulk)
+        return report
+
+    async def _write_batch(self, batch: List[dict], report: IngestionReport, bulk: bool = True) -> None:
+        try:
+            event_ids = await self._write_batch_in_transaction(batch, report, bulk)
+            if event_ids:
+                recommendation_cache.invalidate_all()
+                async with self.session.begin():
+                    await event_index.refresh(self.session, event_ids)
+        finally:
+            if self._created_interests or self._interests_changed:
+                self._created_interests.clear()
+                self._interests_changed = False
+                interest_registry.invalidate()
+
+    async def _write_batch_in_transaction(self, batch: List[dict], report: IngestionReport,
+                                          bulk: bool) -> List[UUID]:
+        event_ids: Dict[str, UUID] = {}
         async with self.session.begin():
-            for event_data in new_events:
-                await self._add_or_update_event(event_data)
+            now = datetime.now()
+            states = await self._get_crawl_states([event_data['link'] for event_data in batch])
+            fingerprints = {}
+            changed = []
+            unchanged_links = []
+            for event_data in batch:
+                link = event_data['link']
+                fingerprint = self.get_event_fingerprint(event_data)
+                state = states.get(link)
+                if state is not None and state.fingerprint == fingerprint and state.event_id is not None:
+                    unchanged_links.append(link)
+                    report.unchanged += 1
+                    continue
+                if state is None:
+                    report.new += 1
+                else:
+                    report.changed += 1
+                fingerprints[link] = fingerprint
+                changed.append(event_data)
+
+            if changed:
+                if bulk:
+                    event_ids = await self._bulk_upsert_events(changed)
+                else:
+                    for event_data in changed:
+                        event = await self._add_or_update_event(event_data)
+                        event_ids[event_data['link']] = event.id
+                await self._upsert_crawl_states(fingerprints, event_ids, now)
+
+            if unchanged_links:
+                await self.session.execute(
+                    update(CrawlState)
+                    .where(CrawlState.link.in_(unchanged_links))
+                    .values(last_seen_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+        return list(set(event_ids.values()))
+
+    async def _get_crawl_states(self, links: List[str]) -> dict:
+        stmt = select(CrawlState.link, CrawlState.fingerprint, CrawlState.event_id).where(CrawlState.link.in_(links))
+        result = await self.session.execute(stmt)
+        return {row.link: row for row in result}
+
+    async def _upsert_crawl_states(self, fingerprints: Dict[str, str], event_ids: Dict[str, UUID],
+                                   now: datetime) -> None:
+        stmt = pg_insert(CrawlState.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CrawlState.link],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "last_seen_at": stmt.excluded.last_seen_at,
+                "event_id": stmt.excluded.event_id,
+            },
+        )
+        await self.session.execute(stmt, [
+            {"link": link, "fingerprint": fingerprint, "last_seen_at": now, "event_id": event_ids[link]}
+            for link, fingerprint in fingerprints.items()
+        ])
+
+    async def _bulk_upsert_events(self, events_data: List[dict]) -> Dict[str, UUID]:
+        interest_ids = await self._resolve_interest_ids(events_data)
+
+        prepared: Dict[Tuple[str, str], dict] = {}
+        link_keys = {}
+        for event_data in events_data:
+            description = event_data.get('description') or ""
+            key = (event_data['title'], self.get_description_hash(description))
+            item = prepared.setdefault(key, {
+                "title": key[0],
+                "description": description,
+                "description_hash": key[1],
+                "date_locations": {},
+                "interest_ids": set(),
+            })
+            for dl in event_data.get('date_locations', []):
+                item["date_locations"][(dl['date'], dl['location'])] = None
+            interest_names = event_data.get('interests', [])
+            if interest_names:
+                parent_name = event_data.get('parent_interest') or self.event_parser.get_parent_name_from_url()
+                item["interest_ids"].update(interest_ids[name] for name in interest_names)
+                item["interest_ids"].add(interest_ids[parent_name])
+            link_keys[event_data['link']] = key
+
+        event_ids = await self._upsert_events(prepared)
+
+        date_location_rows = [
+            {"event_id": event_ids[key], "date": date, "location": location}
+            for key, item in prepared.items() for date, location in item["date_locations"]
+        ]
+        if date_location_rows:
+            stmt = (
+                pg_insert(EventDateLocation.__table__)
+                .on_conflict_do_nothing(constraint="uq_event_date_location")
+                .returning(EventDateLocation.__table__.c.event_id)
+            )
+            result = await self.session.execute(stmt, date_location_rows)
+            dated = {row.event_id for row in result}
+            if dated:
+                await self.session.execute(self._refresh_occurrences_stmt(dated).values(is_active=True))
+
+        association_rows = [
+            {"event_id": event_ids[key], "interest_id": interest_id}
+            for key, item in prepared.items() for interest_id in item["interest_ids"]
+        ]
+        if association_rows:
+            await self.session.execute(pg_insert(event_interest_association).on_conflict_do_nothing(),
+                                       association_rows)
+
+        return {link: event_ids[key] for link, key in link_keys.items()}
+
+    async def _upsert_events(self, prepared: Dict[Tuple[str, str], dict]) -> Dict[Tuple[str, str], UUID]:
+        titles = {title for title, _ in prepared}
+        result = await self.session.execute(
+            select(Event.id, Event.title, Event.description_hash).where(Event.title.in_(titles))
+        )
+        by_key = {}
+        by_title = defaultdict(list)
+        for row in result:
+            by_key[(row.title, row.description_hash)] = row.id
+            by_title[row.title].append(row.id)
+
+        event_ids = {}
+        claimed = set()
+        updates = []
+        inserts = []
+        for key, item in prepared.items():
+            if key in by_key:
+                event_ids[key] = by_key[key]
+                continue
+            title_matches = by_title.get(item["title"], [])
+            if item["description"] != "" and len(title_matches) == 1 and title_matches[0] not in claimed:
+                event_id = title_matches[0]
+                claimed.add(event_id)
+                event_ids[key] = event_id
+                updates.append({
+                    "id": event_id,
+                    "description": item["description"],
+                    "description_hash": item["description_hash"],
+                })
+                continue
+            inserts.append({
+                "id": uuid4(),
+                "title": item["title"],
+                "description": item["description"],
+                "description_hash": item["description_hash"],
+            })
+
+        if updates:
+            await self.session.execute(update(Event), updates)
+        if inserts:
+            stmt = pg_insert(Event.__table__).values(inserts)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_event_title_description_hash",
+                set_={"description": stmt.excluded.description},
+            ).returning(Event.__table__.c.id, Event.__table__.c.title, Event.__table__.c.description_hash)
+            result = await self.session.execute(stmt)
+            for row in result:
+                event_ids[(row.title, row.description_hash)] = row.id
+        return event_ids
+
+    async def _resolve_interest_ids(self, events_data: List[dict]) -> Dict[str, int]:
+        parent_of: Dict[str, str] = {}
+        parents = set()
+        for event_data in events_data:
+            interest_names = event_data.get('interests', [])
+            if not interest_names:
+                continue
+            parent_name = event_data.get('parent_interest') or self.event_parser.get_parent_name_from_url()
+            parents.add(parent_name)
+            for name in interest_names:
+                parent_of.setdefault(name, parent_name)
+        names = parents | parent_of.keys()
+        if not names:
+            return {}
+
+        catalogue = await interest_registry.get(self.session)
+        interest_ids = {name: catalogue.by_name[name] for name in names if name in catalogue.by_name}
+        unknown = names - interest_ids.keys()
+        if unknown:
+            result = await self.session.execute(select(Interest.id, Interest.name).where(Interest.name.in_(unknown)))
+            interest_ids.update({row.name: row.id for row in result})
+
+        missing_parents = parents - interest_ids.keys()
+        if missing_parents:
+            interest_ids.update(await self._insert_interests({"name": name} for name in missing_parents))
+        missing_children = parent_of.keys() - interest_ids.keys()
+        if missing_children:
+            interest_ids.update(await self._insert_interests(
+                {"name": name, "parent_id": interest_ids[parent_of[name]]} for name in missing_children
+            ))
+
+        still_missing = names - interest_ids.keys()
+        if still_missing:
+            result = await self.session.execute(
+                select(Interest.id, Interest.name).where(Interest.name.in_(still_missing))
+            )
+            interest_ids.update({row.name: row.id for row in result})
+        return interest_ids
+
+    async def _insert_interests(self, rows: Iterable[dict]) -> Dict[str, int]:
+        rows = list(rows)
+        stmt = (
+            pg_insert(Interest.__table__)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Interest.__table__.c.name])
+            .returning(Interest.__table__.c.id, Interest.__table__.c.name)
+        )
+        result = await self.session.execute(stmt)
+        inserted = {row.name: row.id for row in result}
+        parent_ids = {row["name"]: row.get("parent_id") for row in rows}
+        for closure_stmt in closure_insert_statements(
+                (interest_id, parent_ids[name]) for name, interest_id in inserted.items()):
+            await self.session.execute(closure_stmt)
+        self._interests_changed = self._interests_changed or bool(inserted)
+        return inserted
+
+    @staticmethod
+    def _refresh_occurrences_stmt(event_ids: Iterable[UUID]) -> Update:
+        dates = select(EventDateLocation.date).where(EventDateLocation.event_id == Event.id)
+        return (
+            update(Event)
+            .where(Event.id.in_(list(event_ids)))
+            .values(
+                next_occurrence=dates.with_only_columns(func.min(EventDateLocation.date)).scalar_subquery(),
+                last_occurrence=dates.with_only_columns(func.max(EventDateLocation.date)).scalar_subquery(),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
     @staticmethod
     def get_description_hash(description: str) -> str:
         return hashlib.md5(description.encode('utf-8')).hexdigest()
 
-    async def _add_or_update_event(self, event_data: dict) -> None:
+    @staticmethod
+    def get_event_fingerprint(event_data: dict) -> str:
+        payload = {
+            "title": event_data['title'],
+            "description": event_data.get('description') or "",
+            "parent_interest": event_data.get('parent_interest'),
+            "interests": sorted(event_data.get('interests', [])),
+            "date_locations": sorted(
+                (dl['date'].isoformat(), dl['location'] or "") for dl in event_data.get('date_locations', [])
+            ),
+        }
+        return hashlib.md5(json.dumps(payload, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    async def _add_or_update_event(self, event_data: dict) -> Event:
         title = event_data['title']
         description = event_data.get('description') or ""
         description_hash = self.get_description_hash(description)
         date_locations = event_data.get('date_locations', [])
         interest_names = event_data.get('interests', [])
+        parent_name = event_data.get('parent_interest') or self.event_parser.get_parent_name_from_url()
 
         existing_event = await self._get_event_by_title_description_hash(title, description_hash)
 
@@ -91,7 +546,7 @@ class EventCRUD:
                 existing_event.description_hash = description_hash
 
             if interest_names:
-                parent_interest = await self._get_or_create_parent_interest()
+                parent_interest = await self._get_or_create_parent_interest(parent_name)
                 child_interests = await self._get_or_create_child_interests(interest_names, parent_interest)
                 interests_set = set(existing_event.interests)
 
@@ -102,22 +557,25 @@ class EventCRUD:
                 if parent_interest not in existing_event.interests:
                     existing_event.interests.append(parent_interest)
             await self.session.flush()
+            return existing_event
 
         else:
 
             new_event = Event(title=title, description=description, description_hash=description_hash)
-            for dl in date_locations:
+            for date, location in dict.fromkeys((dl['date'], dl['location']) for dl in date_locations):
                 new_event.date_locations.append(
-                    EventDateLocation(date=dl['date'], location=dl['location'])
+                    EventDateLocation(date=date, location=location)
                 )
+            new_event.refresh_occurrences()
             if interest_names:
-                parent_interest = await self._get_or_create_parent_interest()
+                parent_interest = await self._get_or_create_parent_interest(parent_name)
                 child_interests = await self._get_or_create_child_interests(interest_names, parent_interest)
                 new_event.interests.extend(child_interests)
                 if parent_interest not in new_event.interests:
                     new_event.interests.append(parent_interest)
             self.session.add(new_event)
             await self.session.flush()
+            return new_event
 
     async def _get_event_by_title_description_hash(self, title: str, description_hash: str) -> Optional[Event]:
         stmt = select(Event).where(
@@ -147,43 +605,70 @@ class EventCRUD:
                     event=event
                 )
                 self.session.add(new_date_location)
+                existing_dates.add(key)
                 new_data_added = True
         if new_data_added:
             event.is_active = True
+            event.refresh_occurrences()
         await self.session.flush()
 
     async def _get_interests_by_names(self, names: List[str]) -> List[Interest]:
         if not names:
             return []
-        lower_names = [name.lower() for name in names]
-        stmt = select(Interest).where(func.lower(Interest.name).in_(lower_names))
-        result = await self.session.execute(stmt)
-        return list(result.scalars())
+        catalogue = await interest_registry.get(self.session)
+        interest_ids = dict.fromkeys(
+            interest_id for interest_id in (catalogue.get_id(name, case_insensitive=True) for name in names)
+            if interest_id is not None
+        )
+        interests = await self._load_interests(interest_ids)
+        return [interests[interest_id] for interest_id in interest_ids if interest_id in interests]
 
-    async def _get_or_create_parent_interest(self) -> Interest:
-        parent_name = self.event_parser.get_parent_name_from_url()
-        stmt = select(Interest).where(Interest.name == parent_name)
-        result = await self.session.execute(stmt)
-        parent_interest = result.scalars().one_or_none()
+    async def _get_interests(self, names: Iterable[str]) -> Dict[str, Interest]:
+        interests: Dict[str, Interest] = {}
+        interest_ids: Dict[str, int] = {}
+        for name in names:
+            if name in self._created_interests:
+                interests[name] = self._created_interests[name]
+                continue
+            interest_id = await interest_registry.get_id(self.session, name)
+            if interest_id is not None:
+                interest_ids[name] = interest_id
+        loaded = await self._load_interests(interest_ids.values())
+        interests.update({name: loaded[i] for name, i in interest_ids.items() if i in loaded})
+        return interests
+
+    async def _get_interest(self, name: str) -> Optional[Interest]:
+        return (await self._get_interests([name])).get(name)
+
+    async def _load_interests(self, interest_ids: Iterable[int]) -> Dict[int, Interest]:
+        interest_ids = set(interest_ids)
+        if not interest_ids:
+            return {}
+        result = await self.session.scalars(select(Interest).where(Interest.id.in_(interest_ids)))
+        return {interest.id: interest for interest in result}
+
+    def _create_interest(self, name: str, parent: Optional[Interest] = None) -> Interest:
+        interest = Interest(name=name, parent=parent)
+        self.session.add(interest)
+        self._created_interests[name] = interest
+        return interest
+
+    async def _get_or_create_parent_interest(self, parent_name: str) -> Interest:
+        parent_interest = await self._get_interest(parent_name)
         if not parent_interest:
-            parent_interest = Interest(name=parent_name)
-            self.session.add(parent_interest)
+            parent_interest = self._create_interest(parent_name)
         await self.session.flush()
         return parent_interest
 
     async def _get_or_create_child_interests(self, names: List[str], parent: Interest) -> List[Interest]:
         if not names:
             return []
-        stmt = select(Interest).where(Interest.name.in_(names), Interest.parent_id == parent.id)
-        result = await self.session.execute(stmt)
-        existing = {i.name: i for i in result.scalars().all()}
-
+        existing = await self._get_interests(names)
         interests = []
         for name in names:
             interest = existing.get(name)
             if not interest:
-                interest = Interest(name=name, parent=parent)
-                self.session.add(interest)
+                interest = existing[name] = self._create_interest(name, parent)
             interests.append(interest)
         await self.session.flush()
         return interests
@@ -1,6 +1,7 @@
 from domain.schemas import Feedback, FeedbackRead
 from sqlalchemy.ext.asyncio import AsyncSession
 from domain.models import UserEventFeedback, User
+from domain.services.recommendations import recommendation_cache
 from sqlalchemy import select, and_
 from typing import Optional
 from uuid import UUID
@@ -21,10 +22,12 @@ class FeedbackCRUD:
             if existing_feedback.like == feedback.feedback:
                 await self.session.delete(existing_feedback)
                 await self.session.commit()
+                recommendation_cache.invalidate_user(user.id)
                 return None
             else:
                 existing_feedback.like = feedback.feedback
                 await self.session.commit()
+                recommendation_cache.invalidate_user(user.id)
                 return FeedbackRead.model_validate(existing_feedback)
 
         new_feedback = UserEventFeedback(
@@ -34,6 +37,7 @@ class FeedbackCRUD:
         )
         self.session.add(new_feedback)
         await self.session.commit()
+        recommendation_cache.invalidate_user(user.id)
         await self.session.refresh(new_feedback)
         return FeedbackRead.model_validate(new_feedback)
 
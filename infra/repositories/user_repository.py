@@ -2,9 +2,11 @@ from domain.schemas import UserCreate, UserRead, InterestAdd
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from domain.models.users import User, Interest
+from domain.models.users import User, Interest, user_interest_association
+from domain.services.interests import interest_registry
+from domain.services.recommendations import recommendation_cache
 from utils import hash_password
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from pydantic import EmailStr
 from domain import exeptions
 from typing import Optional
@@ -36,9 +38,10 @@ class UserCRUD:
         return result.unique().scalars().one_or_none()
 
     async def get_interest_by_name(self, interest_name: str) -> Optional[Interest]:
-        smth = select(Interest).where(Interest.name.ilike(interest_name))
-        result = await self.session.execute(smth)
-        return result.unique().scalars().one_or_none()
+        interest_id = await interest_registry.get_id(self.session, interest_name, case_insensitive=True)
+        if interest_id is None:
+            return None
+        return await self.session.get(Interest, interest_id)
 
     async def create_user(self, user: UserCreate) -> UserRead:
         existing_user_email = await self.get_user_by_email(user.email)
@@ -71,15 +74,17 @@ class UserCRUD:
 
     async def add_interests(self, current_user: User, new_interest: InterestAdd) -> UserRead:
         user = await self.get_user_with_interests(current_user.id)
-        interest = await self.get_interest_by_name(new_interest.name)
+        interest_id = await interest_registry.get_id(self.session, new_interest.name, case_insensitive=True)
 
-        if interest is None:
+        if interest_id is None:
             raise exeptions.BadRequestException("Interest does not exist")
-        if interest in user.interests:
+        if any(interest.id == interest_id for interest in user.interests):
             raise exeptions.BadRequestException("User already has this interest")
 
-        user.interests.append(interest)
         try:
+            await self.session.execute(
+                insert(user_interest_association).values(user_id=user.id, interest_id=interest_id)
+            )
             await self.session.commit()
             await self.session.refresh(user)
         except IntegrityError:
@@ -88,4 +93,5 @@ class UserCRUD:
         except Exception:
             await self.session.rollback()
             raise exeptions.InternalServerErrorException()
+        recommendation_cache.invalidate_user(user.id)
         return UserRead.model_validate(user)
\ No newline at end of file